@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Time of build_enum for a generated enum with and without the on-disk
+cache of lookup tables.
+
+Usage: python benchmarks/bench_build.py [members] [aliases per member]
+"""
+from __future__ import print_function, unicode_literals
+
+import json
+import os
+import sys
+import tempfile
+from enum_custom import MultiValueEnum, CaseInsensitiveMultiValueEnum, build_enum
+from common import best_time
+
+
+def main(member_count=5000, alias_count=10):
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, 'source.json')
+    with open(source, 'w') as source_file:
+        json.dump(dict(('M{}'.format(n), ['m{}_{}'.format(n, a)
+                                          for a in range(alias_count)])
+                       for n in range(member_count)), source_file)
+    print('{} members, {} aliases each'.format(member_count, alias_count))
+    for base in (MultiValueEnum, CaseInsensitiveMultiValueEnum):
+        cache = os.path.join(directory, base.__name__ + '.cache')
+        uncached = best_time(lambda: build_enum('Bench', source, base=base,
+                                                check_overlap=True), 1, 3)
+        build_enum('Bench', source, base=base, cache=cache, check_overlap=True)
+        cached = best_time(lambda: build_enum('Bench', source, base=base,
+                                              cache=cache, check_overlap=True), 1, 3)
+        print('{:<32} {:>8.1f} ms computed {:>8.1f} ms cached'
+              .format(base.__name__, uncached * 1e3, cached * 1e3))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Per-call latency of looking up members by calling the enum classes.
+
+The "EnumMeta chain" column calls EnumMeta.__call__ directly, which is
+what every lookup did before the classes got their own lookup function.
+
+Usage: python benchmarks/bench_constructor.py [number of calls]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+import timeit
+from enum import Enum, EnumMeta
+from enum_custom import (MultiValueEnum, CaseInsensitiveMultiValueEnum,
+                         StrEnum, CaseInsensitiveStrEnum)
+
+
+class Plain(Enum):
+    CLUBS = 'c'
+    DIAMONDS = 'd'
+
+
+class Multi(MultiValueEnum):
+    CLUBS = 'c', 'C', '♣'
+    DIAMONDS = 'd', 'D', '♦'
+
+
+class InsensitiveMulti(CaseInsensitiveMultiValueEnum):
+    CLUBS = 'c', '♣'
+    DIAMONDS = 'd', '♦'
+
+
+class Str(StrEnum):
+    CLUBS = 'c'
+    DIAMONDS = 'd'
+
+
+class InsensitiveStr(CaseInsensitiveStrEnum):
+    CLUBS = 'c'
+    DIAMONDS = 'd'
+
+
+def nanoseconds(statement, number, **names):
+    timer = timeit.Timer(statement, globals=names)
+    return min(timer.repeat(number=number, repeat=7)) / number * 1e9
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print('{:<36} {:>10} {:>16}'.format('lookup', 'call (ns)', 'EnumMeta chain'))
+    cases = [
+        ('Enum', Plain, 'd', 'd'),
+        ('MultiValueEnum', Multi, 'D', 'D'),
+        ('CaseInsensitiveMultiValueEnum', InsensitiveMulti, 'D', 'D'),
+        ('CaseInsensitiveMultiValueEnum (fold)', InsensitiveMulti, 'd', 'D'),
+        ('StrEnum', Str, 'd', 'd'),
+        ('CaseInsensitiveStrEnum', InsensitiveStr, 'D', 'D'),
+        ('CaseInsensitiveStrEnum (fold)', InsensitiveStr, 'd', 'D'),
+    ]
+    for label, enum_class, value, folded in cases:
+        call = nanoseconds('enum_class(value)', number,
+                           enum_class=enum_class, value=value)
+        chain = nanoseconds('call(enum_class, value)', number,
+                            call=EnumMeta.__call__, enum_class=enum_class,
+                            value=folded)
+        print('{:<36} {:>10.0f} {:>16.0f}'.format(label, call, chain))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Memory used per alias by MultiValueEnum by default, with __compact__ and
+with __compact__ and __intern__.
+
+Every measurement runs in a new process, so strings interned by an earlier
+one are counted too.
+
+Usage: python benchmarks/bench_memory.py [members] [aliases per member]
+"""
+from __future__ import print_function, unicode_literals
+
+import gc
+import os
+import subprocess
+import sys
+import tracemalloc
+from enum_custom import MultiValueEnum
+from common import make_enum
+
+
+VALUE_TYPES = {'tuple': tuple, 'list': list, 'set': set}
+MODES = {'default': {}, 'compact': {'compact': True},
+         'intern': {'compact': True, 'intern': True}}
+
+
+def measure(member_count, alias_count, value_type, options, copies):
+    """Bytes per alias for copies enums with the same aliases, including
+    the alias strings, which are created from scratch for every enum,
+    like when they are read from data files.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    enums = []
+    for copy in range(copies):
+        members = [('M{}'.format(n), value_type('m{}_{}'.format(n, a)
+                                                for a in range(alias_count)))
+                   for n in range(member_count)]
+        enums.append(make_enum(MultiValueEnum, 'Bench{}'.format(copy),
+                               members, **options))
+        del members
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert enums[-1]('m1_1') is enums[-1].M1
+    return float(after - before) / (copies * member_count * alias_count)
+
+
+def measure_in_process(member_count, alias_count, value_type, mode, copies):
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), '--measure',
+         str(member_count), str(alias_count), value_type, mode, str(copies)])
+    return float(output)
+
+
+def main():
+    member_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    alias_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print('{} members x {} aliases, bytes per alias (including the alias '
+          'strings):'.format(member_count, alias_count))
+    for copies in (1, 4):
+        for value_type in ('tuple', 'list', 'set'):
+            results = [measure_in_process(member_count, alias_count,
+                                          value_type, mode, copies)
+                       for mode in ('default', 'compact', 'intern')]
+            print('{} enum(s) with {:>5} values: default {:6.1f}, compact '
+                  '{:6.1f}, compact and intern {:6.1f}'
+                  .format(copies, value_type, *results))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--measure']:
+        member_count, alias_count, value_type, mode, copies = sys.argv[2:]
+        print(measure(int(member_count), int(alias_count),
+                      VALUE_TYPES[value_type], MODES[mode], int(copies)))
+    else:
+        main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Compare encode_array with calling the enum for every element.
+
+Usage: python benchmarks/bench_numpy.py [number of elements]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+import timeit
+import numpy
+from enum_custom import MultiValueEnum, encode_array
+from common import make_enum
+
+
+Status = make_enum(MultiValueEnum, 'Status', [
+    ('S{}'.format(n), (n, 'status{}'.format(n), 'STATUS{}'.format(n)))
+    for n in range(300)
+])
+
+# int protocol codes 0-4095, which get a direct-address table
+Code = make_enum(MultiValueEnum, 'Code', [
+    ('C{}'.format(n), tuple(range(n * 4, n * 4 + 4))) for n in range(1024)
+])
+
+
+def loop_encode(values, enum_class=Status):
+    return numpy.array([enum_class(value)._ordinal_
+                        for value in values.tolist()])
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = numpy.random.RandomState(0)
+    ints = rng.randint(0, 300, size)
+    texts = numpy.array(['status{}'.format(n) for n in ints])
+    codes = rng.randint(0, 4096, size)
+
+    for label, enum_class, values in (('int', Status, ints),
+                                      ('str', Status, texts),
+                                      ('code', Code, codes)):
+        assert (loop_encode(values, enum_class) ==
+                encode_array(enum_class, values)).all()
+        loop = min(timeit.repeat(lambda: loop_encode(values, enum_class),
+                                 number=1, repeat=3))
+        vectorized = min(timeit.repeat(lambda: encode_array(enum_class, values),
+                                       number=1, repeat=3))
+        print('{:>4} x {}: loop {:.4f}s, encode_array {:.4f}s, {:.1f}x faster'
+              .format(label, size, loop, vectorized, loop / vectorized))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Memory and lookup throughput of worker processes looking up the aliases
+of a large MultiValueEnum with its dict or with a SharedAliasTable mapped
+from a file, with fork and spawn, and of threads sharing one table.
+
+Memory is read from /proc/self/smaps_rollup, so it's only shown on Linux.
+Private is the growth of the memory of the worker not shared with any other
+process, from its start (before building the enum with spawn) until it
+looked up every alias once, PSS is its proportional share of all memory.
+With fork, the enum is built before forking, but looking it up writes the
+reference counts of objects, so pages of the dict are copied into every
+worker. Throughput is measured with every worker looking up at the same
+time, so it depends on the number of CPUs.
+
+Usage: python benchmarks/bench_shared.py [workers] [members] [aliases per member]
+"""
+from __future__ import print_function, unicode_literals
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from timeit import default_timer
+from enum_custom import MultiValueEnum, SharedAliasTable
+from common import make_enum
+
+
+def make_bench_enum(member_count, alias_count, lazy):
+    # with __lazy__ the dict is only built if the enum itself is looked up
+    return make_enum(MultiValueEnum, 'Bench', [
+        ('M{}'.format(n), tuple('m{}_{}'.format(n, a) for a in range(alias_count)))
+        for n in range(member_count)], lazy=lazy)
+
+
+def aliases(member_count, alias_count):
+    return ['m{}_{}'.format(n, a) for n in range(member_count)
+            for a in range(alias_count)]
+
+
+def memory():
+    """Private and proportional set size in MiB, None if not available."""
+    try:
+        with open('/proc/self/smaps_rollup') as smaps:
+            fields = dict((line.split(':')[0], int(line.split()[1]))
+                          for line in smaps if line.endswith('kB\n'))
+    except (IOError, OSError):
+        return None
+    return ((fields['Private_Clean'] + fields['Private_Dirty']) / 1024.0,
+            fields['Pss'] / 1024.0)
+
+
+def worker(mode, table_path, member_count, alias_count, barrier, results):
+    # enum and table of the parent, if forked
+    global Bench, table
+    values = aliases(member_count, alias_count)
+    before = memory()
+    if 'Bench' not in globals():
+        Bench = make_bench_enum(member_count, alias_count, lazy=mode == 'shared')
+        if mode == 'shared':
+            table = SharedAliasTable.open(Bench, table_path)
+    lookup_many = table.lookup_many if mode == 'shared' else Bench.lookup_many
+    barrier.wait()
+    start = default_timer()
+    _, misses = lookup_many(values)
+    seconds = default_timer() - start
+    assert not misses
+    # measured when every worker is done, so pages are shared by all of them
+    barrier.wait()
+    after = memory()
+    if before is not None:
+        after = (after[0] - before[0], after[1])
+    results.put((len(values) / seconds, after))
+    barrier.wait()
+
+
+def run_workers(method, mode, table_path, worker_count, member_count, alias_count):
+    context = multiprocessing.get_context(method)
+    barrier = context.Barrier(worker_count)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(
+        mode, table_path, member_count, alias_count, barrier, results))
+        for _ in range(worker_count)]
+    for process in processes:
+        process.start()
+    measured = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    throughput = sum(rate for rate, _ in measured) / len(measured)
+    sizes = [size for _, size in measured if size is not None]
+    if sizes:
+        private = sum(size[0] for size in sizes) / len(sizes)
+        pss = sum(size[1] for size in sizes) / len(sizes)
+        size_text = '{:>8.1f} MiB private {:>8.1f} MiB PSS'.format(private, pss)
+    else:
+        size_text = 'memory n/a'
+    print('{:<6} {:<7} {:>10.0f} lookups/s per worker  {}'.format(
+        method, mode, throughput, size_text))
+
+
+def run_threads(thread_count, values):
+    chunks = [values[n::thread_count] for n in range(thread_count)]
+    threads = [threading.Thread(target=table.lookup_many, args=(chunk,))
+               for chunk in chunks]
+    start = default_timer()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(values) / (default_timer() - start)
+
+
+def main(worker_count=4, member_count=20000, alias_count=10):
+    global Bench, table
+    table_path = os.path.join(tempfile.mkdtemp(), 'bench.table')
+    print('{} workers, {} members, {} aliases each'.format(
+        worker_count, member_count, alias_count))
+    SharedAliasTable.create(make_bench_enum(member_count, alias_count, False),
+                            table_path).close()
+    methods = multiprocessing.get_all_start_methods()
+    for method in ('fork', 'spawn'):
+        if method not in methods:
+            print('{:<6} not available'.format(method))
+            continue
+        for mode in ('dict', 'shared'):
+            if method == 'fork':
+                # built in the parent, inherited by the workers
+                Bench = make_bench_enum(member_count, alias_count,
+                                        lazy=mode == 'shared')
+                if mode == 'dict':
+                    Bench('m0_0')
+                else:
+                    table = SharedAliasTable.open(Bench, table_path)
+            run_workers(method, mode, table_path, worker_count,
+                        member_count, alias_count)
+            globals().pop('Bench', None)
+            globals().pop('table', None)
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('threads sharing one table ({}):'.format(
+        'GIL enabled' if gil else 'free-threaded'))
+    Bench = make_bench_enum(member_count, alias_count, lazy=True)
+    table = SharedAliasTable.open(Bench, table_path)
+    values = aliases(member_count, alias_count)
+    for thread_count in (1, 2, 4, 8):
+        print('{:>2} threads {:>10.0f} lookups/s'.format(
+            thread_count, run_threads(thread_count, values)))
+    table.close()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the benchmark scripts."""
+from __future__ import unicode_literals
+
+import timeit
+
+
+def make_enum(base, name, members, **options):
+    """Create an enum class like a class statement does.
+    The functional API doesn't run the metaclass __init__, so it can't be
+    used for the custom enums. Options are set as dunder class attributes,
+    e.g. compact=True is __compact__ = True.
+    """
+    metacls = type(base)
+    classdict = metacls.__prepare__(name, (base,))
+    for option, value in options.items():
+        classdict['__{}__'.format(option)] = value
+    for member_name, value in members:
+        classdict[member_name] = value
+    return metacls(str(name), (base,), classdict)
+
+
+def best_time(func, number, repeat=5):
+    """Best time of one call of func in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Benchmark suite of every enum type and operation of enum_custom, each one
+compared with the same operation on a plain stdlib Enum.
+
+Run the suite and save the results as JSON:
+
+    python benchmarks/suite.py --output before.json
+
+Compare two runs, exits with status 1 if anything got slower than the
+threshold (1.25 = 25% slower):
+
+    python benchmarks/suite.py --compare before.json after.json --threshold 1.25
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import json
+import pickle
+import platform
+import sys
+from enum import Enum, unique
+import enum_custom
+from enum_custom import (MultiValueEnum, CaseInsensitiveMultiValueEnum,
+                         StrEnum, CaseInsensitiveStrEnum, OrderableMixin,
+                         no_overlap)
+from common import make_enum, best_time
+
+
+ALIASES_PER_MEMBER = 10
+
+
+def multi_value_members(alias_count):
+    member_count = max(alias_count // ALIASES_PER_MEMBER, 1)
+    return [('M{}'.format(n), tuple('m{}_{}'.format(n, a)
+                                    for a in range(ALIASES_PER_MEMBER)))
+            for n in range(member_count)]
+
+
+def plain_members(count):
+    return [('M{}'.format(n), 'm{}'.format(n)) for n in range(count)]
+
+
+# Classes for pickling have to be importable, so they are module level
+class PickleMVE(MultiValueEnum):
+    CLUBS = 'c', 'C'
+    DIAMONDS = 'd', 'D'
+
+
+class PickleEnum(Enum):
+    CLUBS = 'c'
+    DIAMONDS = 'd'
+
+
+class PickleStrEnum(StrEnum):
+    CLUBS = 'c'
+    DIAMONDS = 'd'
+
+
+class PickleCaseInsensitiveStrEnum(CaseInsensitiveStrEnum):
+    CLUBS = 'c'
+    DIAMONDS = 'd'
+
+
+def lookup_miss(enum_class, value):
+    try:
+        enum_class(value)
+    except ValueError:
+        pass
+
+
+def benchmarks(quick):
+    """Yield (name, operation, stdlib Enum operation, number of calls)."""
+    sizes = (10, 1000) if quick else (10, 1000, 100000)
+    for size in sizes:
+        number = 1 if size >= 100000 else max(1000 // size, 3)
+        for base in (MultiValueEnum, CaseInsensitiveMultiValueEnum):
+            members = multi_value_members(size)
+            yield ('create {} {} aliases'.format(base.__name__, size),
+                   lambda base=base, members=members: make_enum(base, 'Bench', members),
+                   lambda size=size: make_enum(Enum, 'Bench', plain_members(size)),
+                   number)
+
+    small = make_enum(MultiValueEnum, 'Small', multi_value_members(100))
+    small_ci = make_enum(CaseInsensitiveMultiValueEnum, 'Small',
+                         multi_value_members(100))
+    plain = make_enum(Enum, 'Plain', plain_members(10))
+    yield ('MultiValueEnum hit', lambda: small('m5_5'), lambda: plain('m5'), 10000)
+    yield ('CaseInsensitiveMultiValueEnum hit', lambda: small_ci('M5_5'),
+           lambda: plain('m5'), 10000)
+    yield ('CaseInsensitiveMultiValueEnum hit folded', lambda: small_ci('m5_5'),
+           lambda: plain('m5'), 10000)
+    yield ('MultiValueEnum miss', lambda: lookup_miss(small, 'x'),
+           lambda: lookup_miss(plain, 'x'), 10000)
+    yield ('MultiValueEnum get miss', lambda: small.get('x'),
+           lambda: lookup_miss(plain, 'x'), 10000)
+    values = ['m{}_{}'.format(n % 10, n % 7) for n in range(1000)]
+    plain_values = ['m{}'.format(n % 10) for n in range(1000)]
+    yield ('MultiValueEnum lookup_many 1000', lambda: small.lookup_many(values),
+           lambda: [plain(value) for value in plain_values], 20)
+
+    large_size = 10000 if quick else 100000
+    large = make_enum(MultiValueEnum, 'Large', multi_value_members(large_size))
+    large_plain = make_enum(Enum, 'LargePlain', plain_members(large_size // 10))
+    yield ('no_overlap {} aliases'.format(large_size), lambda: no_overlap(large),
+           lambda: unique(large_plain), 3)
+
+    sortable = make_ordered_enum(OrderableMixin, MultiValueEnum, 300)
+    sortable_plain = make_enum(Enum, 'SortablePlain',
+                               [('M{}'.format(n), n) for n in range(300)])
+    members = list(sortable) * 10
+    members.reverse()
+    plain_sorted = list(sortable_plain) * 10
+    plain_sorted.reverse()
+    yield ('OrderableMixin sorted 3000', lambda: sorted(members),
+           lambda: sorted(plain_sorted, key=lambda member: member.value), 20)
+    yield ('OrderableMixin sorted 3000 sort_key',
+           lambda: sorted(members, key=sortable.sort_key),
+           lambda: sorted(plain_sorted, key=lambda member: member.value), 20)
+
+    for base in (StrEnum, CaseInsensitiveStrEnum):
+        str_enum = make_enum(base, 'Str', plain_members(10))
+        member = str_enum.M5
+        plain_member = plain.M5
+        name = base.__name__
+        yield ('{} lookup'.format(name), lambda str_enum=str_enum: str_enum('m5'),
+               lambda: plain('m5'), 10000)
+        yield ('{} equality'.format(name), lambda member=member: member == 'm5',
+               lambda: plain_member.value == 'm5', 10000)
+        yield ('{} hash'.format(name), lambda member=member: hash(member),
+               lambda: hash(plain_member), 10000)
+
+    for enum_class in (PickleMVE, PickleStrEnum, PickleCaseInsensitiveStrEnum):
+        member = enum_class.DIAMONDS
+        yield ('{} pickle round-trip'.format(enum_class.__name__),
+               lambda member=member: pickle.loads(pickle.dumps(member)),
+               lambda: pickle.loads(pickle.dumps(PickleEnum.DIAMONDS)), 2000)
+
+
+def make_ordered_enum(mixin, base, count):
+    metacls = type(base)
+    bases = (mixin, base)
+    classdict = metacls.__prepare__('Sortable', bases)
+    for n in range(count):
+        classdict['M{}'.format(n)] = (n, 'm{}'.format(n))
+    return metacls(str('Sortable'), bases, classdict)
+
+
+def run(quick):
+    results = {}
+    for name, operation, baseline, number in benchmarks(quick):
+        repeat = 3 if number < 10 else 5
+        seconds = best_time(operation, number, repeat)
+        baseline_seconds = best_time(baseline, number, repeat)
+        results[name] = {
+            'seconds': seconds,
+            'enum_seconds': baseline_seconds,
+            'ratio_to_enum': seconds / baseline_seconds if baseline_seconds else None,
+        }
+        print('{:<50} {:>12.3f} us {:>12.3f} us (Enum)'
+              .format(name, seconds * 1e6, baseline_seconds * 1e6), file=sys.stderr)
+    return {
+        'version': enum_custom.__version__,
+        'python': platform.python_implementation() + ' ' + platform.python_version(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'results': results,
+    }
+
+
+def compare(before_path, after_path, threshold):
+    with open(before_path) as before_file:
+        before = json.load(before_file)['results']
+    with open(after_path) as after_file:
+        after = json.load(after_file)['results']
+    regressions = []
+    for name in sorted(set(before) & set(after)):
+        # compared to Enum in the same run, so different machines and loads
+        # are comparable also
+        ratio = after[name]['ratio_to_enum'] / before[name]['ratio_to_enum']
+        mark = ''
+        if ratio > threshold:
+            regressions.append(name)
+            mark = '  SLOWER'
+        print('{:<50} {:>8.2f}x{}'.format(name, ratio, mark))
+    for name in sorted(set(before) ^ set(after)):
+        print('{:<50} only in {}'.format(name, 'before' if name in before else 'after'))
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help='write the JSON results to this file')
+    parser.add_argument('--quick', action='store_true',
+                        help='skip the biggest enum sizes')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+                        help='compare two JSON results instead of running')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown ratio counted as regression (default 1.25)')
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(args.compare[0], args.compare[1], args.threshold))
+
+    results = json.dumps(run(args.quick), indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(results)
+    else:
+        print(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,87 +2,1700 @@
 from __future__ import unicode_literals
 
 from enum import Enum, EnumMeta, _EnumDict
-from functools import total_ordering
-from collections import Iterable
+from collections import (Iterable, Mapping, MutableMapping, OrderedDict,
+                         Counter, deque, namedtuple)
+from numbers import Integral, Real
+from bisect import bisect_right
+from functools import partial
+from array import array
+import hashlib
+import json
+import marshal
+import mmap
+import operator
+import os
+import struct
+import sys
+from timeit import default_timer
+import threading
+import weakref
+import zlib
 import six
 
 
 __version__ = '0.7.2'
 __all__ = ['MultiValueEnum', 'no_overlap', 'StrEnum', 'CaseInsensitiveStrEnum',
-           'CaseInsensitiveMultiValueEnum', 'OrderableMixin']
+           'CaseInsensitiveMultiValueEnum', 'OrderableMixin',
+           'encode_array', 'decode_array', 'Interval', 'LookupStats',
+           'enable_lookup_stats', 'disable_lookup_stats', 'lookup_stats',
+           'reset_lookup_stats', 'EnumSet', 'EnumMap', 'EnumCounter',
+           'schema_fingerprint', 'encode_member', 'decode_member',
+           'encode_members', 'decode_members', 'build_enum', 'AliasScanner',
+           'AmbiguousPrefixError', 'SharedAliasTable']
+
+
+def _set_ordinals(enum_class):
+    """Store the definition order of every member on the member itself,
+    so comparing or sorting them doesn't need to search _member_names_.
+    """
+    for ordinal, name in enumerate(enum_class._member_names_):
+        enum_class._member_map_[name]._ordinal_ = ordinal
+
+
+def _ordinal(member):
+    try:
+        return member._ordinal_
+    except AttributeError:
+        # plain EnumMeta and the functional API don't store ordinals
+        _set_ordinals(type(member))
+        return member._ordinal_
+
+
+class _ClassCache(object):
+    """Mapping of enum classes to data computed from them, kept in the
+    attribute attr of the class itself. The data usually refers to members,
+    which refer to their class, so in a WeakKeyDictionary it would keep the
+    class alive; in the class it is a cycle, collected with the class.
+    """
+    def __init__(self, attr):
+        self._attr = attr
+
+    def get(self, enum_class, default=None):
+        return enum_class.__dict__.get(self._attr, default)
+
+    def __getitem__(self, enum_class):
+        try:
+            return enum_class.__dict__[self._attr]
+        except KeyError:
+            raise KeyError(enum_class)
+
+    def __setitem__(self, enum_class, value):
+        # subclasses have their own data, it is never inherited
+        type.__setattr__(enum_class, self._attr, value)
+
+    def pop(self, enum_class, default=None):
+        value = self.get(enum_class, default)
+        if self._attr in enum_class.__dict__:
+            type.__delattr__(enum_class, self._attr)
+        return value
+
+
+def _members_by_ordinal(enum_class):
+    """List of the members of enum_class, indexed by ordinal."""
+    try:
+        return _member_lists[enum_class]
+    except KeyError:
+        members = [enum_class._member_map_[name]
+                   for name in enum_class._member_names_]
+        _member_lists[enum_class] = members
+        return members
+
+
+_member_lists = _ClassCache('_member_list_')
+
+
+def _lookup_ordinals(enum_class, values):
+    """Same as lookup_many(values, ordinals=True), for any enum class."""
+    if hasattr(enum_class, 'lookup_many'):
+        return enum_class.lookup_many(values, ordinals=True)
+    ordinals = []
+    misses = []
+    for position, value in enumerate(values):
+        try:
+            ordinals.append(_ordinal(enum_class(value)))
+        except ValueError:
+            misses.append(position)
+            ordinals.append(None)
+    return ordinals, misses
+
+
+def _intern(value):
+    """Intern native str values, so equal aliases share one object, for
+    classes with __intern__.
+    """
+    if type(value) is str:
+        return six.moves.intern(value)
+    return value
+
+
+class _FrozenList(tuple):
+    """Hashable form of a list, only equal to other frozen lists, so it
+    doesn't collide with a tuple alias with the same items.
+    """
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(other) is _FrozenList and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _FrozenDict(frozenset):
+    """Hashable form of a mapping, the frozenset of its items."""
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(other) is _FrozenDict and frozenset.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = frozenset.__hash__
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def _freeze(value):
+    """Hashable form of lists, mappings, sets and bytearrays (and tuples of
+    them) for enums with __freeze__. Other values are returned as they are.
+    """
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    if isinstance(value, Mapping):
+        return _FrozenDict((_freeze(key), _freeze(item))
+                           for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, bytearray):
+        return bytes(value)
+    if isinstance(value, tuple):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _fold_text(value):
+    """Case folding used by the case-insensitive enums. Non-text is untouched."""
+    if isinstance(value, six.text_type):
+        return value.upper()
+    return value
+
+
+class Interval(object):
+    """Half-open numeric interval [start, stop), which can be used as a member
+    value or as an element of a member value of MultiValueEnum. Every number
+    in the interval is looked up as an alias without storing each of them.
+    """
+    __slots__ = ('start', 'stop')
+
+    def __init__(self, start, stop):
+        if stop < start:
+            raise ValueError('Interval stop {!r} is smaller than start {!r}'
+                             .format(stop, start))
+        self.start = start
+        self.stop = stop
+
+    def __contains__(self, value):
+        return self.start <= value < self.stop
+
+    def overlap(self, other):
+        """Return the common part of two intervals or None."""
+        start, stop = max(self.start, other.start), min(self.stop, other.stop)
+        if start >= stop:
+            return None
+        if isinstance(self, _IntRange) or isinstance(other, _IntRange):
+            return _IntRange(start, stop)
+        return Interval(start, stop)
+
+    def __eq__(self, other):
+        if isinstance(other, Interval):
+            return (self.start, self.stop) == (other.start, other.stop)
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, Interval):
+            return (self.start, self.stop) != (other.start, other.stop)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((Interval, self.start, self.stop))
+
+    def __reduce__(self):
+        return Interval, (self.start, self.stop)
+
+    def __repr__(self):
+        return 'Interval({!r}, {!r})'.format(self.start, self.stop)
+
+
+class _IntRange(Interval):
+    # Interval made from a range, only contains integral values
+    __slots__ = ()
+
+    def __contains__(self, value):
+        return self.start <= value < self.stop and value == int(value)
+
+    def __reduce__(self):
+        return _IntRange, (self.start, self.stop)
+
+    def __repr__(self):
+        return 'range({!r}, {!r})'.format(self.start, self.stop)
+
+
+def _as_interval(value):
+    """Interval of value if it is an Interval or a range with step 1."""
+    if isinstance(value, Interval):
+        return value
+    # xrange in Python 2 has no start, stop and step attributes
+    if isinstance(value, six.moves.range) and len(value) > 0:
+        if len(value) == 1 or value[1] - value[0] == 1:
+            return _IntRange(value[0], value[-1] + 1)
+    return None
+
+
+class _IntervalTable(object):
+    """Sorted, non-overlapping boundary table of intervals for binary search.
+    Intervals added later only get the parts not covered already, so
+    the first declared wins, like with ordinary aliases. Ranges only cover
+    integers, the parts of later intervals under them are in the fallback
+    table, for the other numbers.
+    """
+    __slots__ = ('starts', 'pieces', 'fallback')
+
+    def __init__(self):
+        self.starts = []
+        # (interval piece, member) in the same order as starts
+        self.pieces = []
+        self.fallback = None
+
+    def add(self, interval, member):
+        interval_type = type(interval)
+        start, stop = interval.start, interval.stop
+        index = max(bisect_right(self.starts, start) - 1, 0)
+        new_pieces = []
+        while start < stop and index < len(self.pieces):
+            piece = self.pieces[index][0]
+            if piece.stop <= start:
+                index += 1
+                continue
+            if stop <= piece.start:
+                break
+            if start < piece.start:
+                new_pieces.append(interval_type(start, piece.start))
+            if isinstance(piece, _IntRange) and interval_type is not _IntRange:
+                if self.fallback is None:
+                    self.fallback = _IntervalTable()
+                self.fallback.add(Interval(max(start, piece.start),
+                                           min(stop, piece.stop)), member)
+            start = piece.stop
+            index += 1
+        if start < stop:
+            new_pieces.append(interval_type(start, stop))
+        for piece in new_pieces:
+            index = bisect_right(self.starts, piece.start)
+            self.starts.insert(index, piece.start)
+            self.pieces.insert(index, (piece, member))
+
+    def find(self, value):
+        if not isinstance(value, Real):
+            return None
+        index = bisect_right(self.starts, value) - 1
+        if index >= 0:
+            piece, member = self.pieces[index]
+            if value in piece:
+                return member
+        if self.fallback is not None:
+            return self.fallback.find(value)
+        return None
+
+
+class _CompactValue(object):
+    """Value of a member of a compact MultiValueEnum. The aliases are only
+    kept as keys of the lookup table of the class, the value property of
+    the member makes a tuple of the keys found as the member when it's read.
+    """
+    __slots__ = ('_member',)
+
+    def __init__(self, member):
+        self._member = member
+
+    def aliases(self):
+        """The aliases as looked up (case folded for the case-insensitive
+        enums), then the aliases of an earlier member and the intervals.
+        Scans the lookup table of the class.
+        """
+        member = self._member
+        enum_class = type(member)
+        # without the extra aliases of load_aliases
+        value_map = enum_class.__dict__.get('_base_value_map_')
+        if value_map is None:
+            value_map = enum_class._value2member_map_
+        aliases = [alias for alias, owner in value_map.items() if owner is member]
+        aliases.extend(member._shadowed_)
+        aliases.extend(member._intervals_)
+        return tuple(aliases)
+
+    def __iter__(self):
+        return iter(self.aliases())
+
+    def __len__(self):
+        return len(self.aliases())
+
+    def __reduce__(self):
+        return tuple, (self.aliases(),)
+
+    def __repr__(self):
+        return repr(self.aliases())
+
+
+def _compact_values(enum_class, members):
+    """Replace the values of members with _CompactValue, after indexing."""
+    value_map = enum_class._value2member_map_
+    # newer Pythons keep unhashable member values in a list too
+    unhashable_values = enum_class.__dict__.get('_unhashable_values_')
+    compact_values = {}
+    for member in members:
+        try:
+            # remove the original value, which is kept as key by EnumMeta
+            if value_map.get(member._value_) is member:
+                del value_map[member._value_]
+        except TypeError:
+            pass
+        value = _CompactValue(member)
+        compact_values[id(member._value_)] = value
+        member._value_ = value
+    if unhashable_values:
+        unhashable_values[:] = [compact_values.get(id(value), value)
+                                for value in unhashable_values]
+    # a copy is sized to the number of keys, without the removed ones
+    enum_class._value2member_map_ = dict(value_map)
+
+
+def _compact_member(enum_class, value):
+    """Member of a compact enum with the whole value, which is compared with
+    the aliases in the form they are looked up, all the member keeps.
+    """
+    if not isinstance(value, (tuple, list)):
+        return None
+    fold = enum_class._fold_alias
+    freeze = getattr(enum_class, '__freeze__', False)
+    aliases = []
+    for alias in value:
+        if _as_interval(alias) is None:
+            if fold is not None:
+                alias = fold(alias)
+            if freeze:
+                alias = _freeze(alias)
+        if alias not in aliases:
+            aliases.append(alias)
+    for alias in aliases:
+        try:
+            member = enum_class._value2member_map_.get(alias)
+        except TypeError:
+            continue
+        if member is not None:
+            member_aliases = member.value
+            if (len(member_aliases) == len(aliases) and
+                    all(alias in member_aliases for alias in aliases)):
+                return member
+            return None
+    return None
+
+
+def _is_whole_value(key, member):
+    """Whole values are kept as keys by EnumMeta, they are not aliases."""
+    return key is member._value_ or key == member._value_
+
+
+# int aliases are put in a direct-address table if they fill at least
+# 1 / _DENSE_INT_FILL of the range between the smallest and the largest
+_DENSE_INT_FILL = 2
+
+
+def _dense_int_table(value_map):
+    """Return a (first, members) table for the lookup table of an enum with
+    only int aliases in a dense range: members[alias - first] is the member
+    of alias, or None for gaps. None for other enums, which use the dict.
+    """
+    items = []
+    for alias, member in value_map.items():
+        if type(alias) is int:
+            items.append((alias, member))
+        elif not _is_whole_value(alias, member):
+            return None
+    if not items:
+        return None
+    first = min(alias for alias, _ in items)
+    size = max(alias for alias, _ in items) - first + 1
+    if size > len(items) * _DENSE_INT_FILL:
+        return None
+    members = [None] * size
+    for alias, member in items:
+        members[alias - first] = member
+    return first, tuple(members)
+
+
+def _canonical(member):
+    """The first element of the member value."""
+    try:
+        return member._canonical_
+    except AttributeError:
+        # the value of lazy classes is not exhausted before indexing
+        values = member._value_
+        if isinstance(values, Interval):
+            return values
+        return next(iter(values), None)
+
+
+# lookup function of every enum class, which returns the member or None.
+# The class keeps its function in _finder_, this maps id(class) to a weak
+# reference to it, which is faster than looking up attributes of enum
+# classes (EnumMeta has __getattr__) or a WeakKeyDictionary.
+_finders = {}
+# weak references to the classes with a lookup function, which remove
+# them from _finders when they are collected, before their id is reused
+_finder_classes = {}
+
+
+def _no_finder():
+    return None
+
+
+def _finder(enum_class):
+    find = enum_class.__dict__.get('_finder_')
+    if find is None:
+        # classes made with the functional API skip the metaclass __init__
+        _set_ordinals(enum_class)
+        find = _install_finder(enum_class)
+    return find
+
+
+def _forget_finder(key, class_ref):
+    _finders.pop(key, None)
+    _finder_classes.pop(key, None)
+
+
+def _install_finder(enum_class, find=None):
+    if find is None:
+        find = enum_class._make_finder(enum_class)
+    if _stats_options is not None:
+        find = _instrument(enum_class, find, *_stats_options)
+    key = id(enum_class)
+    if key not in _finder_classes:
+        _finder_classes[key] = weakref.ref(enum_class,
+                                           partial(_forget_finder, key))
+    # registered before the class drops the previous function, so lookups
+    # from other threads find one of them
+    _finders[key] = weakref.ref(find)
+    type.__setattr__(enum_class, '_finder_', find)
+    return find
+
+
+def _classes_with_finders():
+    classes = (class_ref() for class_ref in list(_finder_classes.values()))
+    return [enum_class for enum_class in classes if enum_class is not None]
+
+
+def _int_table(enum_class):
+    """The dense int table of the lookup function of an enum, made with it."""
+    _ensure_indexed(enum_class)
+    find = _finder(enum_class)
+    return getattr(getattr(find, '__wrapped__', find), 'int_table', None)
+
+
+# (max_misses, callback) while lookup statistics are enabled
+_stats_options = None
+_lookup_stats = weakref.WeakKeyDictionary()
+
+
+class LookupStats(object):
+    """Lookup counters of one enum class, collected while
+    enable_lookup_stats() is in effect.
+    """
+    def __init__(self, enum_class, max_misses):
+        # the statistics don't keep the class alive
+        self._class_ref = weakref.ref(enum_class)
+        self._name = enum_class.__name__
+        self._qualified_name = '{}.{}'.format(enum_class.__module__,
+                                              enum_class.__name__)
+        self.hits = 0
+        self.misses = 0
+        self.seconds = 0.0
+        self._max_misses = max_misses
+        self._missed = {}
+
+    @property
+    def enum_class(self):
+        """The class, or None if it was garbage collected."""
+        return self._class_ref()
+
+    @property
+    def lookups(self):
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self):
+        lookups = self.lookups
+        return self.hits / float(lookups) if lookups else None
+
+    def _add_miss(self, value):
+        try:
+            hash(value)
+        except TypeError:
+            value = repr(value)
+        missed = self._missed
+        if value in missed:
+            missed[value] += 1
+        elif len(missed) < self._max_misses:
+            missed[value] = 1
+        else:
+            # the new value takes over the smallest counter (Space-Saving),
+            # so many rare values can't push out the frequent ones
+            smallest = min(missed, key=missed.get)
+            missed[value] = missed.pop(smallest) + 1
+
+    def top_misses(self, n=10):
+        """The n most often missed values as (value, count) pairs.
+        Only max_misses values are tracked, so counts are upper estimates.
+        """
+        return sorted(self._missed.items(), key=lambda item: -item[1])[:n]
+
+    def as_dict(self, n=10):
+        return {
+            'enum': self._qualified_name,
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio,
+            'seconds': self.seconds,
+            'top_misses': self.top_misses(n),
+        }
+
+    def __repr__(self):
+        return '<LookupStats {}: {} hits, {} misses>'.format(
+            self._name, self.hits, self.misses)
+
+
+def _instrument(enum_class, find, max_misses, callback):
+    stats = _lookup_stats.get(enum_class)
+    if stats is None:
+        stats = _lookup_stats[enum_class] = LookupStats(enum_class, max_misses)
+    class_ref = weakref.ref(enum_class)
+    timer = default_timer
+
+    def instrumented(value):
+        start = timer()
+        member = find(value)
+        seconds = timer() - start
+        stats.seconds += seconds
+        if member is None:
+            stats.misses += 1
+            stats._add_miss(value)
+        else:
+            stats.hits += 1
+        if callback is not None:
+            callback(class_ref(), value, member, seconds)
+        return member
+
+    instrumented.__wrapped__ = find
+    return instrumented
+
+
+def enable_lookup_stats(max_misses=100, callback=None):
+    """Count hits, misses and time of every lookup of the custom enums,
+    see lookup_stats(). At most max_misses different missed values are
+    kept for each class. callback is called after every lookup with
+    (enum_class, value, member or None, seconds).
+    """
+    global _stats_options
+    _stats_options = (max_misses, callback)
+    for enum_class in _classes_with_finders():
+        find = _finder(enum_class)
+        _install_finder(enum_class, getattr(find, '__wrapped__', find))
+
+
+def disable_lookup_stats():
+    """Put back the uninstrumented lookups. Collected statistics are kept."""
+    global _stats_options
+    _stats_options = None
+    for enum_class in _classes_with_finders():
+        find = _finder(enum_class)
+        _install_finder(enum_class, getattr(find, '__wrapped__', find))
+
+
+def lookup_stats():
+    """Return a {enum class: LookupStats} dict of every class which was
+    looked up while statistics were enabled.
+    """
+    return dict((enum_class, stats) for enum_class, stats in _lookup_stats.items()
+                if stats.lookups)
+
+
+def reset_lookup_stats():
+    _lookup_stats.clear()
+    if _stats_options is not None:
+        enable_lookup_stats(*_stats_options)
+
+
+_NormalizeCacheInfo = namedtuple('NormalizeCacheInfo',
+                                 'hits misses evictions maxsize currsize')
+
+
+class _LRUCache(object):
+    """Bounded mapping which drops the least recently used key when full.
+    maxsize=None means unbounded.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            # reinserting makes it the most recently used
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        return _NormalizeCacheInfo(self.hits, self.misses, self.evictions,
+                                   self.maxsize, len(self._data))
+
+
+# normalized lookup cache of every enum class with __normalizers__
+_normalize_caches = _ClassCache('_normalize_cache_')
+_NOT_CACHED = object()
+
+
+def _normalizer_function(normalizer):
+    if isinstance(normalizer, Mapping):
+        # a mapping replaces the values in it, like legacy synonyms
+        get = normalizer.get
+        return lambda value: get(value, value)
+    return normalizer
+
+
+def _normalize(normalizers, value):
+    for normalizer in normalizers:
+        try:
+            value = normalizer(value)
+        except (TypeError, AttributeError):
+            # the normalizer doesn't apply to this type of value, like
+            # str.strip to numbers
+            continue
+    return value
+
+
+# held while a lazy class is indexed
+_index_lock = threading.Lock()
+
+
+def _make_lazy_finder(enum_class):
+    """Lookup function of a class not indexed yet (with __lazy__ or made
+    with the functional API). The first lookup indexes the class, once,
+    even if more threads look up at the same time.
+    """
+    indexed = []
+    class_ref = weakref.ref(enum_class)
+
+    def index():
+        if not indexed:
+            with _index_lock:
+                if not indexed:
+                    enum_class = class_ref()
+                    enum_class._index_aliases()
+                    find = _finder(enum_class)
+                    indexed.append(getattr(find, '__wrapped__', find))
+        return indexed[0]
+
+    def find(value):
+        return (indexed[0] if indexed else index())(value)
+
+    find.index = index
+    return find
+
+
+def _ensure_indexed(enum_class):
+    if '_interval_table_' not in enum_class.__dict__:
+        find = _finder(enum_class)
+        index = getattr(getattr(find, '__wrapped__', find), 'index', None)
+        if index is not None:
+            index()
+
+
+def _cached_table(cache, enum_class):
+    """The table of enum_class in cache if it was made from the current
+    lookup table of the class, otherwise None.
+    """
+    entry = cache.get(enum_class)
+    if entry is not None and entry[0] is enum_class._value2member_map_:
+        return entry[1]
+    return None
+
+
+def _cache_table(cache, enum_class, value_map, table):
+    """Store table made from value_map in cache and return it, or the one
+    made by an other thread at the same time. load_aliases swaps the lookup
+    table, tables made from the previous one are not stored.
+    """
+    if value_map is not enum_class._value2member_map_:
+        return table
+    entry = cache.get(enum_class)
+    if entry is None or entry[0] is not value_map:
+        entry = cache[enum_class] = (value_map, table)
+    return entry[1]
+
+
+def _make_multi_value_finder(enum_class, value_map=None):
+    """Make the lookup function of a multi-value enum, which returns the
+    member for a value or None. It is made for every class, so it only
+    has the steps needed for that class. It looks up in value_map, the
+    lookup table of the class by default, and has the dense int table of
+    it as its int_table attribute.
+    """
+    if '_interval_table_' not in enum_class.__dict__:
+        return _make_lazy_finder(enum_class)
+    if value_map is None:
+        value_map = enum_class._value2member_map_
+    get = value_map.get
+    int_table = _dense_int_table(value_map)
+    intervals = enum_class._interval_table_
+    case_insensitive = enum_class._fold_alias is not None
+    freeze = getattr(enum_class, '__freeze__', False)
+    compact = getattr(enum_class, '__compact__', False)
+    # the class keeps this function, which doesn't keep the class
+    class_ref = weakref.ref(enum_class)
+
+    def scan_values(value):
+        if compact:
+            # members don't keep their whole value, it's not a key either
+            return _compact_member(class_ref(), value)
+        return class_ref()._scan_values(value)
+
+    def missing(value):
+        member = None
+        if case_insensitive and isinstance(value, six.text_type):
+            # values already in folded form don't need a new string
+            member = get(value.upper())
+        elif intervals is not None:
+            member = intervals.find(value)
+        if member is None:
+            if isinstance(value, class_ref()):
+                return value
+            if compact and type(value) is tuple:
+                return scan_values(value)
+        return member
+
+    def find(value):
+        try:
+            member = get(value)
+        except TypeError:
+            if freeze:
+                try:
+                    member = get(_freeze(value))
+                    if member is not None or not compact:
+                        return member
+                except TypeError:
+                    pass
+            # unhashable value, look it up like Enum does
+            return scan_values(value)
+        if member is None:
+            return missing(value)
+        return member
+
+    find.int_table = int_table
+    normalizers = getattr(enum_class, '__normalizers__', None)
+    if not normalizers:
+        return find
+
+    normalizers = [_normalizer_function(normalizer) for normalizer in normalizers]
+    cache = _normalize_caches[enum_class] = _LRUCache(
+        getattr(enum_class, '__normalize_cache_size__', 1024))
+    cache_get = cache.get
+
+    def find_normalized(value):
+        member = find(value)
+        if member is not None:
+            return member
+        try:
+            member = cache_get(value, _NOT_CACHED)
+        except TypeError:
+            # unhashable values are not normalized
+            return None
+        if member is _NOT_CACHED:
+            member = find(_normalize(normalizers, value))
+            cache.put(value, member)
+        return member
+
+    find_normalized.int_table = int_table
+    return find_normalized
 
 
 class _MultiValueMeta(EnumMeta):
+    # applied to every alias and looked up value, None means no folding
+    _fold_alias = None
+    _make_finder = staticmethod(_make_multi_value_finder)
+
     def __init__(self, clsname, bases, classdict):
-        for member in self.__members__.values():
+        _set_ordinals(self)
+        prebuilt = classdict.get('__prebuilt__')
+        if prebuilt is not None:
+            # tables computed earlier by build_enum from the same definition
+            delattr(self, '__prebuilt__')
+            self._load_prebuilt(prebuilt)
+            _install_finder(self)
+        elif getattr(self, '__lazy__', False):
+            # indexed by the lookup function at the first lookup
+            _install_finder(self)
+            return
+        else:
+            self._index_aliases()
+        if '__encoding__' in classdict:
+            _bytes_index(self)
+
+    def _index_aliases(cls):
+        """Check member values and fill the lookup tables with the aliases."""
+        fold = cls._fold_alias
+        value_map = cls._value2member_map_
+        intervals = _IntervalTable()
+        compact = getattr(cls, '__compact__', False)
+        intern = getattr(cls, '__intern__', False)
+        freeze = getattr(cls, '__freeze__', False)
+        alias_type = getattr(cls, '__alias_type__', None)
+        compact_members = []
+        for name in cls._member_names_:
+            member = cls._member_map_[name]
+            shadowed = []
+            member_intervals = []
             values = member._value_
+            if freeze and not compact:
+                # the whole unhashable value is looked up with a dict probe
+                # too, instead of the linear scan of Enum
+                try:
+                    hash(values)
+                except TypeError:
+                    value_map.setdefault(_freeze(values), member)
+            if _as_interval(values) is not None:
+                # a whole range is one interval, not every number in it
+                if not hasattr(member, '_canonical_'):
+                    member._canonical_ = (values if isinstance(values, Interval)
+                                          else values[0])
+                values = (values,)
             # make sure we only have tuple values, not single values
-            if (not isinstance(values, Iterable) or
+            elif (not isinstance(values, Iterable) or
                     isinstance(values, six.string_types)):
                 raise TypeError('{} = {!r}, should be iterable, not {}!'
                                 .format(member._name_, values, type(values)))
+            elif compact:
+                compact_members.append(member)
             for alias in values:
+                if not hasattr(member, '_canonical_'):
+                    member._canonical_ = alias
+                interval = _as_interval(alias)
+                if interval is not None:
+                    intervals.add(interval, member)
+                    member_intervals.append(interval)
+                    continue
+                if alias_type is not None and not isinstance(alias, alias_type):
+                    raise TypeError('{} alias {!r} should be {}!'.format(
+                                    member._name_, alias, alias_type))
+                if fold is not None:
+                    alias = fold(alias)
+                if freeze:
+                    alias = _freeze(alias)
+                if intern:
+                    alias = _intern(alias)
+                # aliases in an earlier declared interval belong to that
+                if intervals.pieces and intervals.find(alias) is not None:
+                    shadowed.append(alias)
+                    continue
                 # don't touch if already set, so behave like alias
                 # described in python documentation
-                self._value2member_map_.setdefault(alias, member)
+                if value_map.setdefault(alias, member) is not member:
+                    shadowed.append(alias)
+            # other aliases of the member are found in the lookup table,
+            # only set if there are any, the class has empty defaults
+            if shadowed:
+                member._shadowed_ = frozenset(shadowed)
+            if member_intervals:
+                member._intervals_ = tuple(member_intervals)
+        if compact_members:
+            _compact_values(cls, compact_members)
+        # set last, it marks the class indexed
+        cls._interval_table_ = intervals if intervals.pieces else None
+        _install_finder(cls)
+
+    def _load_prebuilt(cls, prebuilt):
+        keys, ordinals, interval_pieces, member_extras = prebuilt
+        members = _members_by_ordinal(cls)
+        for ordinal, shadowed, member_intervals in member_extras:
+            if shadowed:
+                members[ordinal]._shadowed_ = frozenset(shadowed)
+            if member_intervals:
+                members[ordinal]._intervals_ = tuple(
+                    _IntRange(start, stop) if integral else Interval(start, stop)
+                    for start, stop, integral in member_intervals)
+        cls._value2member_map_.update(zip(keys, map(members.__getitem__, ordinals)))
+        intervals = None
+        if interval_pieces:
+            intervals = _IntervalTable()
+            for start, stop, integral, ordinal, table_index in interval_pieces:
+                piece = _IntRange(start, stop) if integral else Interval(start, stop)
+                table = intervals
+                if table_index:
+                    if intervals.fallback is None:
+                        intervals.fallback = _IntervalTable()
+                    table = intervals.fallback
+                table.starts.append(start)
+                table.pieces.append((piece, members[ordinal]))
+        cls._interval_table_ = intervals
+        for member in members:
+            # _canonical() takes the first element of other values
+            if isinstance(member._value_, Interval):
+                member._canonical_ = member._value_
+
+    def __call__(cls, value, *args, **kwds):
+        """Return the appropriate instance with any of the values listed."""
+        if args or kwds:
+            # functional API
+            return super(_MultiValueMeta, cls).__call__(value, *args, **kwds)
+        find = _finders.get(id(cls), _no_finder)() or _finder(cls)
+        member = find(value)
+        if member is not None:
+            return member
+        if cls._fold_alias is not None:
+            value = cls._fold_alias(value)
+        # let Enum raise the usual error for the value
+        return super(_MultiValueMeta, cls).__call__(value)
+
+    def _scan_values(cls, value):
+        # same as the fallback in Enum.__new__ for unhashable values
+        for member in cls._member_map_.values():
+            if member._value_ == value:
+                return member
+        return None
+
+    def get(cls, value, default=None):
+        """Return the member for value or default if there is no such member.
+        Doesn't raise any exception like calling the enum does for missing values.
+        """
+        member = _finder(cls)(value)
+        if member is None:
+            return default
+        return member
+
+    def __contains__(cls, value):
+        """True for members and for any value they can be looked up with."""
+        return _finder(cls)(value) is not None
+
+    def get_bytes(cls, value, default=None):
+        """Same as get for bytes, bytearray or memoryview values, without
+        decoding them. str aliases are matched in the __encoding__ declared
+        in the class (UTF-8 by default). Case-insensitive enums fold the
+        ASCII letters of the value.
+        """
+        return _get_bytes(cls, value, default)
+
+    def lookup_bytes_many(cls, buffer, offsets, default=None, ordinals=False):
+        """lookup_many for the slices of buffer (bytes, bytearray, memoryview
+        or anything with the buffer protocol) given as (start, end) offsets.
+        """
+        return _lookup_bytes_many(cls, buffer, offsets, default, ordinals)
+
+    def alias_index(cls):
+        """EnumMap of every member to its aliases (see the aliases property
+        of members). Built once and shared, don't change it.
+        """
+        index = _cached_table(_alias_indexes, cls)
+        if index is None:
+            _ensure_indexed(cls)
+            value_map = cls._value2member_map_
+            index = _cache_table(_alias_indexes, cls, value_map,
+                                 EnumMap(cls, _alias_sets(cls, value_map)))
+        return index
+
+    def load_aliases(cls, aliases):
+        """Replace the extra aliases of the class with aliases, a mapping of
+        members (or member names) to iterables of aliases, which are looked
+        up like the declared ones. They are checked like no_overlap does,
+        with the declared aliases and each other. The new lookup table is
+        built aside, lookups from other threads use the previous one until
+        it's swapped in. load_aliases({}) removes the extra aliases.
+        """
+        _load_aliases(cls, aliases)
+
+    def from_prefix(cls, prefix):
+        """Return the member with a name or str alias starting with prefix.
+        A whole name or alias wins, otherwise raises AmbiguousPrefixError if
+        more members match and ValueError if none.
+        """
+        return _from_prefix(cls, prefix)
+
+    def completions(cls, prefix):
+        """Sorted list of the names and str aliases starting with prefix."""
+        return _completions(cls, prefix)
+
+    def normalize_cache_info(cls):
+        """Statistics of the cache of normalized lookups as a
+        (hits, misses, evictions, maxsize, currsize) named tuple,
+        or None if the enum has no __normalizers__.
+        """
+        _ensure_indexed(cls)
+        cache = _normalize_caches.get(cls)
+        return cache.info() if cache is not None else None
+
+    def normalize_cache_clear(cls):
+        _ensure_indexed(cls)
+        cache = _normalize_caches.get(cls)
+        if cache is not None:
+            cache.clear()
+
+    def lookup_many(cls, values, default=None, ordinals=False):
+        """Look up every element of values in one call.
+        Returns a (results, misses) tuple, where results has the member
+        (or its ordinal if ordinals=True) for every value in the same order,
+        default for values which are not found and misses is the list of
+        positions of those values. It never raises ValueError.
+        """
+        _ensure_indexed(cls)
+        # read once, load_aliases swaps the function with its int table,
+        # functions counting statistics don't have it
+        find = _finder(cls)
+        table = getattr(find, 'int_table', None)
+        results = []
+        misses = []
+        append = results.append
+        if table is not None:
+            # int values are looked up without a call, others with find
+            first, members = table
+            size = len(members)
+            for position, value in enumerate(values):
+                member = None
+                if type(value) is int and 0 <= value - first < size:
+                    member = members[value - first]
+                if member is None:
+                    member = find(value)
+                if member is None:
+                    misses.append(position)
+                    append(default)
+                elif ordinals:
+                    append(member._ordinal_)
+                else:
+                    append(member)
+            return results, misses
+        for position, value in enumerate(values):
+            member = find(value)
+            if member is None:
+                misses.append(position)
+                append(default)
+            elif ordinals:
+                append(member._ordinal_)
+            else:
+                append(member)
+        return results, misses
+
+
+def _alias_sets(enum_class, value_map):
+    """(member, frozenset of aliases) of every member from value_map, with
+    the declared aliases shadowed by an other member.
+    """
+    members = _members_by_ordinal(enum_class)
+    freeze = getattr(enum_class, '__freeze__', False)
+    aliases = dict((member, list(member._shadowed_)) for member in members)
+    whole_values = {}
+    for member in members:
+        value = member._value_
+        if freeze:
+            try:
+                hash(value)
+            except TypeError:
+                value = _freeze(value)
+        whole_values[member] = value
+    for alias, member in value_map.items():
+        value = whole_values[member]
+        # whole values are kept as keys by EnumMeta, they are not aliases
+        if alias is not value and alias != value:
+            aliases[member].append(alias)
+    return [(member, frozenset(aliases[member])) for member in members]
+
+
+_reload_lock = threading.Lock()
+
+
+def _load_aliases(enum_class, aliases):
+    _ensure_indexed(enum_class)
+    fold = enum_class._fold_alias
+    freeze = getattr(enum_class, '__freeze__', False)
+    layer = {}
+    for member, member_aliases in aliases.items():
+        if not isinstance(member, enum_class):
+            member = enum_class[member]
+        folded = []
+        for alias in member_aliases:
+            if _as_interval(alias) is not None:
+                raise TypeError('Interval {!r} can not be an extra alias'
+                                .format(alias))
+            if fold is not None:
+                alias = fold(alias)
+            folded.append(_freeze(alias) if freeze else alias)
+        layer.setdefault(member, []).extend(folded)
+
+    with _reload_lock:
+        base_map = enum_class.__dict__.get('_base_value_map_')
+        if base_map is None:
+            base_map = enum_class._base_value_map_ = enum_class._value2member_map_
+        _check_layer(enum_class, base_map, layer)
+        value_map = dict(base_map)
+        for member, member_aliases in layer.items():
+            for alias in member_aliases:
+                value_map.setdefault(alias, member)
+        # made aside with its int table, lookups use either the old or the
+        # new function, and both look up in their own table
+        find = enum_class._make_finder(enum_class, value_map)
+        enum_class._value2member_map_ = value_map
+        _install_finder(enum_class, find)
+        # tables made from the aliases are made again when used, the ones
+        # made from the previous lookup table at the same time are not kept
+        for cache in (_prefix_tries, _bytes_indexes, _array_tables,
+                      _alias_indexes):
+            cache.pop(enum_class, None)
+        if getattr(enum_class, '__encoding__', None) is not None:
+            _bytes_index(enum_class)
+
+
+def _check_layer(enum_class, base_map, layer):
+    """no_overlap for extra aliases: they can't be aliases of other members,
+    declared or extra. Overlaps of declared aliases are not checked here.
+    """
+    intervals = enum_class._interval_table_
+    members = _members_by_ordinal(enum_class)
+    owners = {}
+    common = {}
+    for member in members:
+        for alias in layer.get(member, ()):
+            other = owners.setdefault(alias, member)
+            if other is member:
+                other = base_map.get(alias)
+                if other is None and intervals is not None:
+                    other = intervals.find(alias)
+            if other is not None and other is not member:
+                common.setdefault(alias, set()).update(
+                    (member._ordinal_, other._ordinal_))
+    _raise_common(enum_class, [member._name_ for member in members], common)
+
+
+class _MultiValueMixin(object):
+    """Member properties and methods of the multi-value enums."""
+    # declared aliases looked up as an earlier member and declared intervals
+    _shadowed_ = frozenset()
+    _intervals_ = ()
+
+    @property
+    def aliases(self):
+        """frozenset of the aliases of the member (case folded for the
+        case-insensitive enums), except intervals. Made at the first use
+        for every member of the class.
+        """
+        return type(self).alias_index()[self]
 
+    @property
+    def value(self):
+        """The value of the member, a tuple made from the lookup table for
+        the members of compact enums.
+        """
+        value = self._value_
+        if type(value) is _CompactValue:
+            return value.aliases()
+        return value
 
-class MultiValueEnum(six.with_metaclass(_MultiValueMeta, Enum)):
+    @property
+    def canonical(self):
+        """The first alias of the member, as declared."""
+        return _canonical(self)
+
+    def __contains__(self, value):
+        """True if value is one of the aliases of this member, even if the
+        class would look it up as an other member, which declared it first.
+        """
+        enum_class = type(self)
+        _ensure_indexed(enum_class)
+        fold = enum_class._fold_alias
+        if fold is not None:
+            value = fold(value)
+        try:
+            if (enum_class._value2member_map_.get(value) is self or
+                    value in self._shadowed_):
+                return True
+        except TypeError:
+            if not getattr(enum_class, '__freeze__', False):
+                # unhashable values can't be aliases
+                return False
+            try:
+                value = _freeze(value)
+                return (enum_class._value2member_map_.get(value) is self or
+                        value in self._shadowed_)
+            except TypeError:
+                return False
+        if self._intervals_ and isinstance(value, Real):
+            return any(value in interval for interval in self._intervals_)
+        return False
+
+
+class MultiValueEnum(six.with_metaclass(_MultiValueMeta, _MultiValueMixin, Enum)):
     """Enum subclass where a member can be any iterable (except str).
     You can reference a member by any of its element in the associated iterable.
     """
 
 
-class _CasInsensitiveMultiValueMeta(EnumMeta):
-    def __init__(self, clsname, bases, classdict):
-        # make sure we only have tuple values, not single values
-        for member in self.__members__.values():
-            values = member._value_
-            if (not isinstance(values, Iterable) or
-                    isinstance(values, six.string_types)):
-                raise TypeError('{} = {!r}, should be iterable, not {}!'
-                                .format(member._name_, values, type(values)))
-            for alias in values:
-                if isinstance(alias, six.text_type):
-                    alias = alias.upper()
-                self._value2member_map_.setdefault(alias, member)
-
-    def __call__(cls, value):
-        """Return the appropriate instance with any of the values listed."""
-        if isinstance(value, six.text_type):
-            value = value.upper()
-        return super(_CasInsensitiveMultiValueMeta, cls).__call__(value)
+class _CasInsensitiveMultiValueMeta(_MultiValueMeta):
+    _fold_alias = staticmethod(_fold_text)
 
 
 class CaseInsensitiveMultiValueEnum(
-        six.with_metaclass(_CasInsensitiveMultiValueMeta, Enum)):
+        six.with_metaclass(_CasInsensitiveMultiValueMeta, _MultiValueMixin, Enum)):
     """Same as MultiValueEnum, except when member value contains an str,
     they will be compared in a case-insensitive manner. Non-str types left
     untouched.
     """
 
 
-def no_overlap(multienum):
+def no_overlap(multienum=None, case_insensitive=False):
     """Class decorator for MultiValueEnum ensuring non overlapping elements
     in member values. Other words: ensure no element in any member value is
     present in any other member value.
+    With case_insensitive=True, str elements are compared after the same
+    case folding CaseInsensitiveMultiValueEnum does, e.g.
+    @no_overlap(case_insensitive=True)
+    """
+    if multienum is None:
+        return lambda multienum: no_overlap(multienum, case_insensitive)
+
+    owners = {}
+    names = []
+    intervals = []
+    for member in multienum.__members__.values():
+        index = len(names)
+        names.append(member._name_)
+        values = member._value_
+        if _as_interval(values) is not None:
+            values = (values,)
+        for alias in values:
+            interval = _as_interval(alias)
+            if interval is not None:
+                intervals.append((interval.start, interval, index))
+                continue
+            if case_insensitive:
+                alias = _fold_text(alias)
+            alias_owners = owners.setdefault(alias, [])
+            if index not in alias_owners:
+                alias_owners.append(index)
+
+    common = {}
+
+    def add_common(index, other_index, element):
+        common.setdefault(element, set()).update((index, other_index))
+
+    for alias, alias_owners in owners.items():
+        for pos, index in enumerate(alias_owners):
+            for prev_index in alias_owners[:pos]:
+                add_common(index, prev_index, alias)
+
+    if intervals:
+        intervals.sort(key=lambda item: item[0])
+        starts = [start for start, _, _ in intervals]
+        # biggest stop so far, to know how far back an interval can reach
+        max_stops = []
+        active = []
+        for start, interval, index in intervals:
+            max_stops.append(max(max_stops[-1], interval.stop)
+                             if max_stops else interval.stop)
+            active = [item for item in active if item[0].stop > start]
+            for other, other_index in active:
+                overlap = interval.overlap(other)
+                if other_index != index and overlap is not None:
+                    add_common(index, other_index, overlap)
+            active.append((interval, index))
+
+        for alias, alias_owners in owners.items():
+            if not isinstance(alias, Real):
+                continue
+            position = bisect_right(starts, alias) - 1
+            while position >= 0 and max_stops[position] > alias:
+                _, interval, interval_index = intervals[position]
+                if alias in interval:
+                    for index in alias_owners:
+                        if index != interval_index:
+                            add_common(index, interval_index, alias)
+                position -= 1
+
+    _raise_common(multienum, names, common)
+    return multienum
+
+
+def _raise_common(multienum, names, common):
+    """Raise the ValueError of no_overlap if common has any element,
+    common maps the common elements to the indexes of names having them.
+    Elements with the same owners are reported together, every element once.
+    """
+    if common:
+        groups = {}
+        for element, indexes in common.items():
+            owners = tuple(sorted(indexes, reverse=True))
+            groups.setdefault(owners, set()).add(element)
+        alias_details = ', '.join(["{} -> {}".format(
+                                   ' & '.join(names[index] for index in owners),
+                                   elements)
+                                  for owners, elements in sorted(groups.items())])
+        raise ValueError('common element found in {!r}: {}'
+                         .format(multienum, alias_details))
+
+
+# bump when the layout of the cached tables changes
+_TABLE_FORMAT = 3
+_TABLE_MAGIC = b'ENUMTBL'
+
+
+def _dump_tables(enum_class):
+    _ensure_indexed(enum_class)
+    value_map = enum_class._value2member_map_
+    intervals = enum_class._interval_table_
+    interval_pieces = ()
+    if intervals is not None:
+        # the pieces of the fallback table are not integral
+        fallback = intervals.fallback.pieces if intervals.fallback else ()
+        interval_pieces = tuple(
+            (piece.start, piece.stop, isinstance(piece, _IntRange),
+             member._ordinal_, table_index)
+            for table_index, pieces in enumerate((intervals.pieces, fallback))
+            for piece, member in pieces)
+    # declared aliases which are not in the lookup table and intervals
+    member_extras = tuple(
+        (member._ordinal_, tuple(member._shadowed_),
+         tuple((interval.start, interval.stop, isinstance(interval, _IntRange))
+               for interval in member._intervals_))
+        for member in _members_by_ordinal(enum_class)
+        if member._shadowed_ or member._intervals_)
+    return (tuple(value_map),
+            tuple(member._ordinal_ for member in value_map.values()),
+            interval_pieces, member_extras)
+
+
+def _read_tables(path, header):
+    try:
+        with open(path, 'rb') as cache_file:
+            data = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (IOError, OSError, ValueError):
+        # missing or empty
+        return None
+    try:
+        if data[:len(header)] != header:
+            return None
+        if six.PY2:
+            return marshal.loads(data[len(header):])
+        view = memoryview(data)
+        try:
+            return marshal.loads(view[len(header):])
+        finally:
+            view.release()
+    except (ValueError, EOFError, TypeError):
+        return None
+    finally:
+        data.close()
+
+
+def _write_tables(path, header, tables):
+    try:
+        payload = marshal.dumps(tables)
+    except ValueError:
+        # aliases of types marshal doesn't support are not cached
+        return
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(header)
+            cache_file.write(payload)
+        # other processes see either the old or the new file, never half
+        getattr(os, 'replace', os.rename)(temp_path, path)
+    except (IOError, OSError):
+        # the cache is only an optimization, e.g. read-only installs work
+        # without it
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def build_enum(name, source, base=MultiValueEnum, cache=None,
+               check_overlap=False, module=None):
+    """Make a MultiValueEnum (or base subclass) named name from source,
+    a mapping of member names to iterables of aliases or the path of a
+    JSON file with such an object.
+    With cache as a file path, the computed lookup tables are saved there,
+    and loaded instead of computing them again, as long as the source,
+    base, check_overlap, this library and the Python version are the same.
+    check_overlap=True runs no_overlap (case insensitively for
+    CaseInsensitiveMultiValueEnum), only when the tables are computed.
+    Set values are sorted, so the canonical alias is the same in every
+    process, sets of aliases which can't be sorted can't be cached.
     """
-    duplicates = []
+    if isinstance(source, six.string_types):
+        with open(source, 'rb') as source_file:
+            definition = source_file.read()
+        items = json.loads(definition.decode('utf-8'),
+                           object_pairs_hook=OrderedDict).items()
+    else:
+        items = list(source.items())
+        definition = None
+
     members = []
+    for member_name, values in items:
+        if isinstance(values, (set, frozenset)):
+            # the order of sets depends on the hash seed of the process
+            try:
+                values = tuple(sorted(values))
+            except TypeError:
+                if cache is not None:
+                    raise TypeError('{} = {!r}, unordered aliases can not be '
+                                    'cached'.format(member_name, values))
+                values = tuple(values)
+        elif (isinstance(values, Iterable) and _as_interval(values) is None and
+                not isinstance(values, six.string_types)):
+            # generators would be different in every process
+            values = tuple(values)
+        members.append((member_name, values))
+    if definition is None:
+        # the repr of generators has their address, so normalized values
+        definition = repr(members).encode('utf-8')
+
+    header = None
+    prebuilt = None
+    if cache is not None:
+        key = '\n'.join([str(_TABLE_FORMAT), __version__, sys.version,
+                         base.__module__, base.__name__, name, str(check_overlap)])
+        fingerprint = hashlib.sha1(key.encode('utf-8') + definition).digest()
+        header = _TABLE_MAGIC + struct.pack('<B', _TABLE_FORMAT) + fingerprint
+        prebuilt = _read_tables(cache, header)
+
+    metacls = type(base)
+    classdict = metacls.__prepare__(name, (base,))
+    for member_name, values in members:
+        classdict[member_name] = values
+    if module is None:
+        # like the functional API of Enum, so members can be pickled
+        module = sys._getframe(1).f_globals.get('__name__', '__main__')
+    classdict['__module__'] = module
+    if prebuilt is not None:
+        classdict['__prebuilt__'] = prebuilt
+    enum_class = metacls(str(name), (base,), classdict)
+
+    if prebuilt is None:
+        if check_overlap:
+            no_overlap(enum_class,
+                       case_insensitive=enum_class._fold_alias is not None)
+        if cache is not None:
+            _write_tables(cache, header, _dump_tables(enum_class))
+    return enum_class
+
+
+# bytes keyed lookup table of every class looked up with bytes
+_bytes_indexes = _ClassCache('_bytes_index_')
+
+
+def _bytes_index(enum_class):
+    """Map of the str aliases encoded with the __encoding__ of the class
+    (UTF-8 by default) and the bytes aliases to members.
+    """
+    index = _cached_table(_bytes_indexes, enum_class)
+    if index is not None:
+        return index
+    _ensure_indexed(enum_class)
+    encoding = getattr(enum_class, '__encoding__', 'utf-8')
+    value_map = enum_class._value2member_map_
+    index = {}
+    for alias, member in value_map.items():
+        if isinstance(alias, six.text_type):
+            try:
+                alias = alias.encode(encoding)
+            except UnicodeEncodeError:
+                continue
+        elif not isinstance(alias, bytes):
+            continue
+        # the first one wins, like in the value map
+        index.setdefault(alias, member)
+    return _cache_table(_bytes_indexes, enum_class, value_map, index)
+
+
+def _get_bytes(enum_class, value, default):
+    index = _bytes_index(enum_class)
+    if type(value) is not bytes:
+        # bytearray is not hashable, memoryview would copy to hash anyway
+        value = bytes(value)
+    member = index.get(value)
+    if member is None and enum_class._fold_alias is not None:
+        # aliases are stored folded, bytes.upper() only changes ASCII letters
+        member = index.get(value.upper())
+    if member is None:
+        return default
+    return member
+
+
+def _lookup_bytes_many(enum_class, buffer, offsets, default, ordinals):
+    index = _bytes_index(enum_class)
+    get = index.get
+    fold = enum_class._fold_alias is not None
+    if type(buffer) is not bytes:
+        buffer = memoryview(buffer)
+    results = []
+    misses = []
+    append = results.append
+    for position, (start, end) in enumerate(offsets):
+        token = buffer[start:end]
+        if type(token) is not bytes:
+            token = token.tobytes()
+        member = get(token)
+        if member is None and fold:
+            member = get(token.upper())
+        if member is None:
+            misses.append(position)
+            append(default)
+        elif ordinals:
+            append(member._ordinal_)
+        else:
+            append(member)
+    return results, misses
+
+
+class AmbiguousPrefixError(ValueError):
+    """Raised when a prefix matches more members. candidates is the list
+    of those members in definition order.
+    """
+    def __init__(self, message, candidates):
+        super(AmbiguousPrefixError, self).__init__(message)
+        self.candidates = candidates
+
+
+# more members have keys starting with the prefix
+_AMBIGUOUS = object()
+
+
+class _PrefixTrie(object):
+    """Trie of the member names and text aliases of an enum. Every node
+    knows the member of the key ending there and the only member of the
+    keys under it (or _AMBIGUOUS), so a prefix is resolved in one walk.
+    """
+    __slots__ = ('root',)
+
+    def __init__(self, items):
+        # [children, member of the key ending here, member of keys below]
+        self.root = [{}, None, None]
+        for key, member in items:
+            node = self.root
+            self._add_member(node, member)
+            for char in key:
+                child = node[0].get(char)
+                if child is None:
+                    child = node[0][char] = [{}, None, None]
+                node = child
+                self._add_member(node, member)
+            if node[1] is None:
+                node[1] = member
+
+    @staticmethod
+    def _add_member(node, member):
+        if node[2] is None:
+            node[2] = member
+        elif node[2] is not member:
+            node[2] = _AMBIGUOUS
+
+    def find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node[0].get(char)
+            if node is None:
+                return None
+        return node
+
+    def keys(self, prefix, node):
+        """(key, member) of every key starting with prefix, from its node."""
+        stack = [(prefix, node)]
+        while stack:
+            key, node = stack.pop()
+            if node[1] is not None:
+                yield key, node[1]
+            stack.extend((key + char, child) for char, child in node[0].items())
+
+
+_prefix_tries = _ClassCache('_prefix_trie_')
+_alias_indexes = _ClassCache('_alias_index_')
+
+
+def _prefix_trie(enum_class):
+    trie = _cached_table(_prefix_tries, enum_class)
+    if trie is not None:
+        return trie
+    _ensure_indexed(enum_class)
+    fold = enum_class._fold_alias
+    value_map = enum_class._value2member_map_
+    items = [(fold(name) if fold else name, member)
+             for name, member in enum_class.__members__.items()]
+    items.extend((alias, member) for alias, member in value_map.items()
+                 if isinstance(alias, six.text_type))
+    # built once, a class built by more threads at the same time gets
+    # one of the equal tries
+    return _cache_table(_prefix_tries, enum_class, value_map, _PrefixTrie(items))
+
 
-    for member in multienum.__members__.values():
-        for prev_member in members:
-            intersection = set(member._value_) & set(prev_member._value_)
-            if intersection:
-                duplicates.append((member._name_, prev_member._name_, intersection))
-        members.append(member)
-
-    if duplicates:
-        alias_details = ', '.join(["{} & {} -> {}".format(alias, name, intersection)
-                                  for (alias, name, intersection) in duplicates])
-        raise ValueError('common element found in {!r}: {}'
-                         .format(multienum, alias_details))
-    return multienum
+def _fold_prefix(enum_class, prefix):
+    if not isinstance(prefix, six.text_type):
+        raise TypeError('prefix should be text, not {}'.format(type(prefix)))
+    if enum_class._fold_alias is not None:
+        return enum_class._fold_alias(prefix)
+    return prefix
+
+
+def _from_prefix(enum_class, prefix):
+    prefix = _fold_prefix(enum_class, prefix)
+    trie = _prefix_trie(enum_class)
+    node = trie.find(prefix)
+    if node is None:
+        raise ValueError('{!r} is not a prefix of any {} name or value'
+                         .format(prefix, enum_class.__name__))
+    if node[1] is not None:
+        # a whole key wins over longer keys
+        return node[1]
+    if node[2] is _AMBIGUOUS:
+        members = set(member for _, member in trie.keys(prefix, node))
+        candidates = [member for member in _members_by_ordinal(enum_class)
+                      if member in members]
+        raise AmbiguousPrefixError('{!r} is an ambiguous prefix of {}: {}'.format(
+            prefix, enum_class.__name__,
+            ', '.join(member._name_ for member in candidates)), candidates)
+    return node[2]
+
+
+def _completions(enum_class, prefix):
+    prefix = _fold_prefix(enum_class, prefix)
+    trie = _prefix_trie(enum_class)
+    node = trie.find(prefix)
+    if node is None:
+        return []
+    return sorted(key for key, _ in trie.keys(prefix, node))
 
 
 class _CheckTypeDict(_EnumDict):
@@ -97,7 +1710,88 @@ class _CheckTypeDict(_EnumDict):
                             key, value, self._expected_type))
 
 
-class StrEnum(six.text_type, Enum):
+def _make_str_finder(enum_class):
+    """Make the lookup function of a StrEnum, which returns the member
+    for a value or None.
+    """
+    get = enum_class._value2member_map_.get
+
+    def find(value):
+        if isinstance(value, six.text_type):
+            return get(value)
+        return None
+
+    return find
+
+
+def _make_case_insensitive_str_finder(enum_class):
+    """Make the lookup function of a CaseInsensitiveStrEnum, which returns
+    the member for a value or None.
+    """
+    get = enum_class._value2member_map_.get
+
+    def find(value):
+        if not isinstance(value, six.text_type):
+            return None
+        # values already in folded form don't need a new string
+        member = get(value)
+        if member is None:
+            member = get(value.upper())
+        return member
+
+    return find
+
+
+class _StrEnumMeta(EnumMeta):
+    _fold_alias = None
+    _make_finder = staticmethod(_make_str_finder)
+
+    def __init__(self, cls, bases, classdict):
+        _set_ordinals(self)
+        _install_finder(self)
+        if '__encoding__' in classdict:
+            _bytes_index(self)
+
+    def get(cls, value, default=None):
+        """Return the member for value or default if there is no such member.
+        Doesn't raise any exception like calling the enum does for missing values.
+        """
+        member = _finder(cls)(value)
+        if member is None:
+            return default
+        return member
+
+    def __contains__(cls, value):
+        """True for members and for any value they can be looked up with."""
+        return _finder(cls)(value) is not None
+
+    def get_bytes(cls, value, default=None):
+        """Same as get for bytes, bytearray or memoryview values, without
+        decoding them. str aliases are matched in the __encoding__ declared
+        in the class (UTF-8 by default). Case-insensitive enums fold the
+        ASCII letters of the value.
+        """
+        return _get_bytes(cls, value, default)
+
+    def lookup_bytes_many(cls, buffer, offsets, default=None, ordinals=False):
+        """lookup_many for the slices of buffer (bytes, bytearray, memoryview
+        or anything with the buffer protocol) given as (start, end) offsets.
+        """
+        return _lookup_bytes_many(cls, buffer, offsets, default, ordinals)
+
+    def from_prefix(cls, prefix):
+        """Return the member with a name or value starting with prefix.
+        A whole name or value wins, otherwise raises AmbiguousPrefixError if
+        more members match and ValueError if none.
+        """
+        return _from_prefix(cls, prefix)
+
+    def completions(cls, prefix):
+        """Sorted list of the names and values starting with prefix."""
+        return _completions(cls, prefix)
+
+
+class StrEnum(six.with_metaclass(_StrEnumMeta, six.text_type, Enum)):
     """Enum subclass which members are also instances of str
     and directly comparable to strings. str type is forced at declaration.
     """
@@ -108,15 +1802,27 @@ class StrEnum(six.text_type, Enum):
         return super(StrEnum, cls).__new__(cls, *args)
 
 
-class _CaseInsensitiveEnumMeta(EnumMeta):
+_text_eq = six.text_type.__eq__
+
+
+class _CaseInsensitiveEnumMeta(_StrEnumMeta):
+    _fold_alias = staticmethod(_fold_text)
+    _make_finder = staticmethod(_make_case_insensitive_str_finder)
+
     def __init__(self, cls, bases, classdict):
+        value_map = self._value2member_map_
         for name, member in self._member_map_.items():
-            self._value2member_map_.pop(member._value_)
-            member._value_ = member.value.upper()
-            # need to update also
-            self._value2member_map_[member._value_] = member
+            value_map.pop(member._value_, None)
+            member._value_ = member._value_.upper()
+            # need to update also, so the map holds the folded values
+            value_map[member._value_] = member
+        super(_CaseInsensitiveEnumMeta, self).__init__(cls, bases, classdict)
 
     def __call__(cls, value):
+        find = _finders.get(id(cls), _no_finder)() or _finder(cls)
+        member = find(value)
+        if member is not None:
+            return member
         return cls.__new__(cls, value.upper())
 
 
@@ -131,14 +1837,29 @@ class CaseInsensitiveStrEnum(
                 raise TypeError('Not text %s:' % arg)
         return super(CaseInsensitiveStrEnum, cls).__new__(cls, *checkargs)
 
+    # members are stored uppercase, so hash is the same as their folded value.
+    # Equal strings in other case have other hashes, so dicts and sets of
+    # members only match the folded form, a str subclass can't do better.
+    __hash__ = six.text_type.__hash__
+
     def __eq__(self, other):
-        return self.upper() == other.upper()
+        if isinstance(other, six.text_type):
+            # members are folded, so canonical values need no new string
+            return _text_eq(self, other) or _text_eq(self, other.upper())
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
 
 
-@total_ordering
 class OrderableMixin(object):
     """Mixin for comparable Enums. The order is the definition order
     from smaller to bigger.
+    Every member has an ordinal attribute (its position in definition order)
+    and sort_key can be used as key function for sorted(), heapq, etc.
     """
     # From Python manual:
     # If a class that overrides __eq__() needs to retain
@@ -151,13 +1872,1305 @@ class OrderableMixin(object):
         # this will never run anyway, but the Enum class needs it
         return self.__qualname__
 
+    @property
+    def ordinal(self):
+        try:
+            return self._ordinal_
+        except AttributeError:
+            # plain EnumMeta doesn't store ordinals, do it once for the class
+            _set_ordinals(self.__class__)
+            return self._ordinal_
+
+    def sort_key(self):
+        return self.ordinal
+
     def __eq__(self, other):
         if self.__class__ is other.__class__:
             return self._value_ == other._value_
         return NotImplemented
 
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return self._value_ != other._value_
+        return NotImplemented
+
     def __lt__(self, other):
         if self.__class__ is other.__class__:
-            names = self.__class__._member_names_
-            return names.index(self._name_) < names.index(other._name_)
+            return self.ordinal < other.ordinal
+        return NotImplemented
+
+    def __le__(self, other):
+        if self.__class__ is other.__class__:
+            return self.ordinal <= other.ordinal
+        return NotImplemented
+
+    def __gt__(self, other):
+        if self.__class__ is other.__class__:
+            return self.ordinal > other.ordinal
+        return NotImplemented
+
+    def __ge__(self, other):
+        if self.__class__ is other.__class__:
+            return self.ordinal >= other.ordinal
+        return NotImplemented
+
+
+class EnumSet(object):
+    """Mutable set of the members of one enum class, stored as a bitmask of
+    member ordinals, so it is small and set operations are int operations.
+    Iterates in definition order.
+    """
+    __slots__ = ('_enum', '_bits')
+
+    def __init__(self, enum_class, members=()):
+        self._enum = enum_class
+        self._bits = 0
+        for member in members:
+            self.add(member)
+
+    @classmethod
+    def from_bits(cls, enum_class, bits):
+        """Make an EnumSet from a bitmask, where bit n is the member
+        with ordinal n.
+        """
+        if bits >> len(enum_class._member_names_):
+            raise ValueError('{} has no member for bitmask {:#x}'
+                             .format(enum_class.__name__, bits))
+        enum_set = cls.__new__(cls)
+        enum_set._enum = enum_class
+        enum_set._bits = bits
+        return enum_set
+
+    @classmethod
+    def from_values(cls, enum_class, values):
+        """Make an EnumSet by looking up every element of values.
+        Raises ValueError for values which are not found.
+        """
+        values = list(values)
+        ordinals, misses = _lookup_ordinals(enum_class, values)
+        if misses:
+            raise ValueError('{!r} are not valid {}'.format(
+                [values[index] for index in misses], enum_class.__name__))
+        bits = 0
+        for ordinal in ordinals:
+            bits |= 1 << ordinal
+        return cls.from_bits(enum_class, bits)
+
+    @classmethod
+    def all_of(cls, enum_class):
+        return cls.from_bits(enum_class,
+                             (1 << len(enum_class._member_names_)) - 1)
+
+    @property
+    def enum_class(self):
+        return self._enum
+
+    @property
+    def bits(self):
+        """The bitmask as an int, bit n is set for the member with ordinal n."""
+        return self._bits
+
+    def _bit(self, member):
+        if type(member) is not self._enum:
+            raise TypeError('{!r} is not a member of {}'
+                            .format(member, self._enum.__name__))
+        return 1 << _ordinal(member)
+
+    def add(self, member):
+        self._bits |= self._bit(member)
+
+    def discard(self, member):
+        self._bits &= ~self._bit(member)
+
+    def remove(self, member):
+        bit = self._bit(member)
+        if not self._bits & bit:
+            raise KeyError(member)
+        self._bits ^= bit
+
+    def clear(self):
+        self._bits = 0
+
+    def copy(self):
+        return self.from_bits(self._enum, self._bits)
+
+    def complement(self):
+        """EnumSet of the members not in this set."""
+        all_bits = (1 << len(self._enum._member_names_)) - 1
+        return self.from_bits(self._enum, all_bits & ~self._bits)
+
+    def __contains__(self, member):
+        if type(member) is not self._enum:
+            return False
+        return bool(self._bits >> _ordinal(member) & 1)
+
+    def __len__(self):
+        return bin(self._bits).count('1')
+
+    def __bool__(self):
+        return bool(self._bits)
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        members = _members_by_ordinal(self._enum)
+        bits = self._bits
+        while bits:
+            lowest = bits & -bits
+            yield members[lowest.bit_length() - 1]
+            bits ^= lowest
+
+    def _other_bits(self, other):
+        if not isinstance(other, EnumSet):
+            return None
+        if other._enum is not self._enum:
+            raise TypeError('Can not combine EnumSets of {} and {}'.format(
+                            self._enum.__name__, other._enum.__name__))
+        return other._bits
+
+    def __or__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        return self.from_bits(self._enum, self._bits | bits)
+
+    def __and__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        return self.from_bits(self._enum, self._bits & bits)
+
+    def __sub__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        return self.from_bits(self._enum, self._bits & ~bits)
+
+    def __xor__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        return self.from_bits(self._enum, self._bits ^ bits)
+
+    def __ior__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        self._bits |= bits
+        return self
+
+    def __iand__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        self._bits &= bits
+        return self
+
+    def __isub__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        self._bits &= ~bits
+        return self
+
+    def __ixor__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        self._bits ^= bits
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, EnumSet):
+            return self._enum is other._enum and self._bits == other._bits
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, EnumSet):
+            return self._enum is not other._enum or self._bits != other._bits
         return NotImplemented
+
+    def __le__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        return self._bits & ~bits == 0
+
+    def __ge__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        return bits & ~self._bits == 0
+
+    def __lt__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        return self._bits & ~bits == 0 and self._bits != bits
+
+    def __gt__(self, other):
+        bits = self._other_bits(other)
+        if bits is None:
+            return NotImplemented
+        return bits & ~self._bits == 0 and self._bits != bits
+
+    def _as_enum_set(self, other):
+        if isinstance(other, EnumSet):
+            return other
+        return EnumSet(self._enum, other)
+
+    def issubset(self, other):
+        return self <= self._as_enum_set(other)
+
+    def issuperset(self, other):
+        return self >= self._as_enum_set(other)
+
+    def isdisjoint(self, other):
+        return not self & self._as_enum_set(other)
+
+    # mutable like set
+    __hash__ = None
+
+    def __reduce__(self):
+        return _enum_set_from_bits, (self._enum, self._bits)
+
+    def __repr__(self):
+        return '{}({}, [{}])'.format(type(self).__name__, self._enum.__name__,
+                                     ', '.join(repr(member) for member in self))
+
+
+def _enum_set_from_bits(enum_class, bits):
+    # pickle needs a module level function
+    return EnumSet.from_bits(enum_class, bits)
+
+
+# marks the members not in an EnumMap
+_EMPTY = object()
+
+
+class EnumMap(MutableMapping):
+    """Mapping with the members of one enum class as keys, stored in a list
+    indexed by member ordinal, so no member is hashed. Iterates in
+    definition order.
+    """
+    __slots__ = ('_enum', '_values')
+
+    def __init__(self, enum_class, items=()):
+        self._enum = enum_class
+        self._values = [_EMPTY] * len(enum_class._member_names_)
+        self.update(items)
+
+    @property
+    def enum_class(self):
+        return self._enum
+
+    def _index(self, member):
+        if type(member) is not self._enum:
+            raise TypeError('{!r} is not a member of {}'
+                            .format(member, self._enum.__name__))
+        return _ordinal(member)
+
+    def __getitem__(self, member):
+        if type(member) is self._enum:
+            value = self._values[_ordinal(member)]
+            if value is not _EMPTY:
+                return value
+        raise KeyError(member)
+
+    def __setitem__(self, member, value):
+        self._values[self._index(member)] = value
+
+    def __delitem__(self, member):
+        if member not in self:
+            raise KeyError(member)
+        self._values[_ordinal(member)] = _EMPTY
+
+    def __contains__(self, member):
+        return (type(member) is self._enum and
+                self._values[_ordinal(member)] is not _EMPTY)
+
+    def __iter__(self):
+        members = _members_by_ordinal(self._enum)
+        for ordinal, value in enumerate(self._values):
+            if value is not _EMPTY:
+                yield members[ordinal]
+
+    def __len__(self):
+        return len(self._values) - self._values.count(_EMPTY)
+
+    def items(self):
+        members = _members_by_ordinal(self._enum)
+        return [(members[ordinal], value)
+                for ordinal, value in enumerate(self._values)
+                if value is not _EMPTY]
+
+    def values(self):
+        return [value for value in self._values if value is not _EMPTY]
+
+    def clear(self):
+        self._values = [_EMPTY] * len(self._values)
+
+    def copy(self):
+        enum_map = type(self).__new__(type(self))
+        enum_map._enum = self._enum
+        enum_map._values = list(self._values)
+        return enum_map
+
+    def update_values(self, items):
+        """Update from (alias, value) pairs, looking up the aliases.
+        Returns the positions of the pairs with aliases not found, like
+        lookup_many, those are skipped.
+        """
+        items = list(items)
+        ordinals, misses = _lookup_ordinals(self._enum,
+                                            [alias for alias, _ in items])
+        values = self._values
+        for ordinal, (_, value) in zip(ordinals, items):
+            if ordinal is not None:
+                values[ordinal] = value
+        return misses
+
+    def _check_other(self, other):
+        if not isinstance(other, EnumMap) or other._enum is not self._enum:
+            raise TypeError('Can only merge with {} of {}'.format(
+                            type(self).__name__, self._enum.__name__))
+
+    def merge(self, other, combine):
+        """Merge other EnumMap of the same enum into this one element-wise.
+        Where both have a value, combine(value, other_value) is stored.
+        """
+        self._check_other(other)
+        self._values = [value if other_value is _EMPTY else
+                        other_value if value is _EMPTY else
+                        combine(value, other_value)
+                        for value, other_value in zip(self._values, other._values)]
+
+    def __eq__(self, other):
+        if isinstance(other, EnumMap) and other._enum is self._enum:
+            return self._values == other._values
+        return super(EnumMap, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return type(self), (self._enum, self.items())
+
+    def __repr__(self):
+        return '{}({}, {{{}}})'.format(
+            type(self).__name__, self._enum.__name__,
+            ', '.join('{!r}: {!r}'.format(member, value)
+                      for member, value in self.items()))
+
+
+class EnumCounter(EnumMap):
+    """Counter of the members of one enum class, stored in a list of counts
+    indexed by member ordinal. Members with zero count are not in it.
+    """
+    __slots__ = ()
+
+    def __init__(self, enum_class, iterable=()):
+        self._enum = enum_class
+        self._values = [0] * len(enum_class._member_names_)
+        self.update(iterable)
+
+    def __getitem__(self, member):
+        if type(member) is self._enum:
+            return self._values[_ordinal(member)]
+        raise KeyError(member)
+
+    def __delitem__(self, member):
+        self._values[self._index(member)] = 0
+
+    def __contains__(self, member):
+        return type(member) is self._enum and self._values[_ordinal(member)] != 0
+
+    def __iter__(self):
+        members = _members_by_ordinal(self._enum)
+        for ordinal, count in enumerate(self._values):
+            if count:
+                yield members[ordinal]
+
+    def __len__(self):
+        return len(self._values) - self._values.count(0)
+
+    def items(self):
+        members = _members_by_ordinal(self._enum)
+        return [(members[ordinal], count)
+                for ordinal, count in enumerate(self._values) if count]
+
+    def values(self):
+        return [count for count in self._values if count]
+
+    def clear(self):
+        self._values = [0] * len(self._values)
+
+    def total(self):
+        return sum(self._values)
+
+    def most_common(self, n=None):
+        """List of the n most common (member, count) pairs, most common first."""
+        items = sorted(self.items(), key=lambda item: -item[1])
+        return items if n is None else items[:n]
+
+    def update(self, iterable=()):
+        """Count members of iterable or add counts of a mapping."""
+        if isinstance(iterable, EnumCounter) and iterable._enum is self._enum:
+            self.merge(iterable)
+            return
+        values = self._values
+        if isinstance(iterable, Mapping):
+            for member, count in iterable.items():
+                values[self._index(member)] += count
+        else:
+            # Counter counts the ordinals in C, members are not hashed
+            for ordinal, count in Counter(map(self._index, iterable)).items():
+                values[ordinal] += count
+
+    def update_values(self, values):
+        """Count the members of raw aliases, looking up every alias.
+        Returns the positions of the aliases not found, like lookup_many,
+        those are not counted.
+        """
+        ordinals, misses = _lookup_ordinals(self._enum, values)
+        # hashing ordinals is cheap and Counter counts them in C
+        counts = Counter(ordinals)
+        counts.pop(None, None)
+        counters = self._values
+        for ordinal, count in counts.items():
+            counters[ordinal] += count
+        return misses
+
+    def merge(self, other):
+        """Add the counts of other EnumCounter of the same enum."""
+        self._check_other(other)
+        self._values = list(map(operator.add, self._values, other._values))
+
+    def __add__(self, other):
+        if not isinstance(other, EnumCounter):
+            return NotImplemented
+        result = self.copy()
+        result.merge(other)
+        return result
+
+    def __iadd__(self, other):
+        if not isinstance(other, EnumCounter):
+            return NotImplemented
+        self.merge(other)
+        return self
+
+    def __reduce__(self):
+        return type(self), (self._enum, dict(self.items()))
+
+
+_get_ordinal = operator.attrgetter('_ordinal_')
+# array type codes for ordinals of 1, 2 and 4 bytes
+_ordinal_typecodes = dict((array(code).itemsize, code) for code in 'LIHB')
+# schema fingerprint and ordinal width before encoded members
+_codec_header = struct.Struct('<8sB')
+
+
+def _ordinal_width(enum_class):
+    """Smallest number of bytes the ordinals of enum_class fit in."""
+    count = len(enum_class._member_names_)
+    if count <= 1 << 8:
+        return 1
+    if count <= 1 << 16:
+        return 2
+    return 4
+
+
+def schema_fingerprint(enum_class):
+    """8 bytes identifying the class name and the member names in definition
+    order, which the ordinals of encoded members depend on.
+    """
+    return _get_header(enum_class)[:8]
+
+
+def _get_header(enum_class):
+    try:
+        return _codec_headers[enum_class]
+    except KeyError:
+        definition = '\n'.join([enum_class.__name__] +
+                               list(enum_class._member_names_))
+        fingerprint = hashlib.sha1(definition.encode('utf-8')).digest()[:8]
+        header = _codec_header.pack(fingerprint, _ordinal_width(enum_class))
+        _codec_headers[enum_class] = header
+        return header
+
+
+_codec_headers = weakref.WeakKeyDictionary()
+
+
+def _check_header(enum_class, data):
+    header_size = _codec_header.size
+    if len(data) < header_size:
+        raise ValueError('Encoded {} is too short'.format(enum_class.__name__))
+    if data[:header_size] != _get_header(enum_class):
+        raise ValueError('Encoded with a different definition of {}'
+                         .format(enum_class.__name__))
+
+
+class _MemberSequence(object):
+    """Read-only sequence of members decoded from a buffer of ordinals."""
+    __slots__ = ('_members', 'ordinals')
+
+    def __init__(self, members, ordinals):
+        self._members = members
+        self.ordinals = ordinals
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._members[ordinal] for ordinal in self.ordinals[index]]
+        return self._members[self.ordinals[index]]
+
+    def __iter__(self):
+        return six.moves.map(self._members.__getitem__, self.ordinals)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '<decoded {!r}>'.format(list(self))
+
+
+def encode_member(member, header=True):
+    """Encode a member as its ordinal in the smallest width fitting
+    every member of its class, little-endian. With header, the schema
+    fingerprint of the class and the width are written before it.
+    """
+    enum_class = type(member)
+    width = _ordinal_width(enum_class)
+    data = struct.pack('<' + _ordinal_typecodes[width], _ordinal(member))
+    if header:
+        return _get_header(enum_class) + data
+    return data
+
+
+def decode_member(enum_class, data, header=True):
+    """Decode a member of enum_class encoded by encode_member."""
+    offset = 0
+    width = _ordinal_width(enum_class)
+    if header:
+        _check_header(enum_class, data)
+        offset = _codec_header.size
+    if len(data) < offset + width:
+        raise ValueError('Encoded {} is too short'.format(enum_class.__name__))
+    ordinal, = struct.unpack_from('<' + _ordinal_typecodes[width], data, offset)
+    try:
+        return _members_by_ordinal(enum_class)[ordinal]
+    except IndexError:
+        raise ValueError('{} is not a valid ordinal of {}'
+                         .format(ordinal, enum_class.__name__))
+
+
+def encode_members(enum_class, members, header=True):
+    """Encode a sequence of members of enum_class as an array of their
+    ordinals in the smallest fitting width, little-endian, in bytes.
+    """
+    if not isinstance(members, (list, tuple)):
+        members = list(members)
+    for member_type in set(map(type, members)):
+        if member_type is not enum_class:
+            raise TypeError('{!r} is not a member of {}'.format(
+                next(member for member in members if type(member) is member_type),
+                enum_class.__name__))
+    if members:
+        # plain EnumMeta doesn't store ordinals
+        _ordinal(members[0])
+    typecode = _ordinal_typecodes[_ordinal_width(enum_class)]
+    ordinals = array(typecode, map(_get_ordinal, members))
+    if sys.byteorder == 'big':
+        ordinals.byteswap()
+    data = ordinals.tobytes() if six.PY3 else ordinals.tostring()
+    if header:
+        return _get_header(enum_class) + data
+    return data
+
+
+def decode_members(enum_class, data, header=True):
+    """Decode members encoded by encode_members. On little-endian machines
+    with Python 3, the ordinals are not copied from data: the returned
+    sequence reads them through a memoryview of the buffer.
+    """
+    width = _ordinal_width(enum_class)
+    view = memoryview(data)
+    if header:
+        _check_header(enum_class, view)
+        view = view[_codec_header.size:]
+    if len(view) % width:
+        raise ValueError('Encoded {} is truncated'.format(enum_class.__name__))
+    typecode = _ordinal_typecodes[width]
+    if sys.byteorder == 'little' and hasattr(view, 'cast'):
+        ordinals = view.cast(typecode)
+    else:
+        ordinals = array(typecode, view.tobytes())
+        if sys.byteorder == 'big':
+            ordinals.byteswap()
+    members = _members_by_ordinal(enum_class)
+    if len(ordinals) and max(ordinals) >= len(members):
+        raise ValueError('{} is not a valid ordinal of {}'
+                         .format(max(ordinals), enum_class.__name__))
+    return _MemberSequence(members, ordinals)
+
+
+# A shared alias table is a header, a hash table of slots with linear
+# probing and the keys. The header has the digest of the declared aliases
+# of the members. Slots are (CRC-32 of key, ordinal + 1 or 0 for empty
+# slots, offset of key, length of key).
+_SHARED_MAGIC = b'ENUMSHT'
+_SHARED_FORMAT = 3
+_shared_header = struct.Struct('<7sB8s8sII')
+_shared_slot = struct.Struct('<IIII')
+
+
+def _shared_key(value):
+    """Bytes form of a str, bytes or number alias or looked up value in a
+    shared table, the same for values equal in Python. None for others.
+    """
+    if isinstance(value, six.text_type):
+        return b's' + value.encode('utf-8', 'surrogatepass')
+    if isinstance(value, bytes):
+        if six.PY2:
+            try:
+                # equal to the same unicode
+                value.decode('ascii')
+                return b's' + value
+            except UnicodeDecodeError:
+                pass
+        return b'b' + value
+    if isinstance(value, Integral):
+        return b'i' + str(int(value)).encode('ascii')
+    if isinstance(value, float):
+        if value.is_integer():
+            return b'i' + str(int(value)).encode('ascii')
+        return b'f' + repr(value).encode('ascii')
+    return None
+
+
+def _shared_items(enum_class):
+    """(key, ordinal) pairs of the aliases of enum_class in a shared table."""
+    _ensure_indexed(enum_class)
+    if enum_class._interval_table_ is not None:
+        raise TypeError('Intervals of {} can not be in a shared table'
+                        .format(enum_class.__name__))
+    items = []
+    for alias, member in enum_class._value2member_map_.items():
+        if _is_whole_value(alias, member):
+            continue
+        key = _shared_key(alias)
+        if key is None:
+            raise TypeError('{!r} alias of {} can not be in a shared table'
+                            .format(alias, enum_class.__name__))
+        items.append((key, _ordinal(member)))
+    return items
+
+
+def _definition_digest(enum_class):
+    """8 bytes identifying the declared aliases of every member of
+    enum_class, which its shared tables are made from. Member values are
+    read without indexing the class, except values which can't be iterated
+    again (generators, compact values), which are taken from the lookup
+    table. Made once for every class.
+    """
+    try:
+        return _definition_digests[enum_class]
+    except KeyError:
+        pass
+    fold = getattr(enum_class, '_fold_alias', None)
+    freeze = getattr(enum_class, '__freeze__', False)
+    indexed_aliases = None
+    digest = hashlib.sha1()
+    for member in _members_by_ordinal(enum_class):
+        values = member._value_
+        if _as_interval(values) is not None:
+            values = (values,)
+        if type(values) is _CompactValue or iter(values) is values:
+            if indexed_aliases is None:
+                indexed_aliases = _indexed_aliases(enum_class)
+            aliases = indexed_aliases[member._ordinal_]
+        else:
+            aliases = []
+            for alias in values:
+                interval = _as_interval(alias)
+                if interval is not None:
+                    alias = interval
+                else:
+                    if fold is not None:
+                        alias = fold(alias)
+                    if freeze:
+                        alias = _freeze(alias)
+                aliases.append(alias)
+        # repeated and shadowed aliases are the same in both forms this way
+        keys = sorted(set(_shared_key(alias) or
+                          b'?' + repr(alias).encode('utf-8') for alias in aliases))
+        digest.update(struct.pack('<II', member._ordinal_, len(keys)))
+        for key in keys:
+            digest.update(struct.pack('<I', len(key)))
+            digest.update(key)
+    return _definition_digests.setdefault(enum_class, digest.digest()[:8])
+
+
+def _indexed_aliases(enum_class):
+    """Declared aliases of every member by ordinal from the lookup table,
+    without the extra aliases of load_aliases.
+    """
+    _ensure_indexed(enum_class)
+    value_map = enum_class.__dict__.get('_base_value_map_')
+    if value_map is None:
+        value_map = enum_class._value2member_map_
+    members = _members_by_ordinal(enum_class)
+    aliases = [list(member._shadowed_) + list(member._intervals_)
+               for member in members]
+    for alias, member in value_map.items():
+        if not _is_whole_value(alias, member):
+            aliases[member._ordinal_].append(alias)
+    return aliases
+
+
+_definition_digests = weakref.WeakKeyDictionary()
+
+
+def _dump_shared_table(enum_class):
+    items = _shared_items(enum_class)
+    slot_count = 8
+    while slot_count < len(items) * 2:
+        slot_count *= 2
+    mask = slot_count - 1
+    slots = bytearray(slot_count * _shared_slot.size)
+    keys = bytearray()
+    keys_start = _shared_header.size + len(slots)
+    for key, ordinal in items:
+        code = zlib.crc32(key) & 0xffffffff
+        index = code & mask
+        while _shared_slot.unpack_from(slots, index * _shared_slot.size)[1]:
+            index = (index + 1) & mask
+        _shared_slot.pack_into(slots, index * _shared_slot.size, code,
+                               ordinal + 1, keys_start + len(keys), len(key))
+        keys += key
+    header = _shared_header.pack(_SHARED_MAGIC, _SHARED_FORMAT,
+                                 schema_fingerprint(enum_class),
+                                 _definition_digest(enum_class), slot_count,
+                                 len(items))
+    return header + bytes(slots) + bytes(keys)
+
+
+class SharedAliasTable(object):
+    """Read-only lookup table of the aliases of an enum in a flat buffer: a
+    file mapped with mmap, a multiprocessing.shared_memory block or any
+    object with the buffer protocol. Lookups only read the buffer, they
+    don't change reference counts of objects in it like looking up in the
+    dict of the enum does, so forked processes keep sharing its pages.
+    Only str, bytes and number aliases can be in it, without intervals.
+    Normalizers of the enum are not applied. The table is checked to be
+    made from the same member names and declared aliases, without indexing
+    the enum, unless it has values which can be iterated only once.
+    """
+    def __init__(self, enum_class, buffer):
+        if len(buffer) < _shared_header.size:
+            raise ValueError('Shared table of {} is too short'
+                             .format(enum_class.__name__))
+        magic, table_format, fingerprint, digest, slot_count, key_count = \
+            _shared_header.unpack_from(buffer, 0)
+        if magic != _SHARED_MAGIC or table_format != _SHARED_FORMAT:
+            raise ValueError('Not a shared table of {}'.format(enum_class.__name__))
+        if fingerprint != schema_fingerprint(enum_class):
+            raise ValueError('Shared table of a different definition of {}'
+                             .format(enum_class.__name__))
+        # the member names don't tell if the aliases are the same
+        if digest != _definition_digest(enum_class):
+            raise ValueError('Shared table of different aliases of {}'
+                             .format(enum_class.__name__))
+        self.enum_class = enum_class
+        self._buffer = buffer
+        self._mask = slot_count - 1
+        self._key_count = key_count
+        self._members = _members_by_ordinal(enum_class)
+        self._fold = getattr(enum_class, '_fold_alias', None)
+        self._mmap = None
+
+    @staticmethod
+    def dump(enum_class):
+        """The table of enum_class as bytes, e.g. to copy it to shared memory."""
+        return _dump_shared_table(enum_class)
+
+    @classmethod
+    def create(cls, enum_class, path):
+        """Write the table of enum_class to the file path, replacing it
+        atomically, and open it.
+        """
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temp_path, 'wb') as table_file:
+            table_file.write(_dump_shared_table(enum_class))
+        getattr(os, 'replace', os.rename)(temp_path, path)
+        return cls.open(enum_class, path)
+
+    @classmethod
+    def open(cls, enum_class, path):
+        """Map the table file written by create read-only."""
+        with open(path, 'rb') as table_file:
+            data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            table = cls(enum_class, data)
+        except ValueError:
+            data.close()
+            raise
+        table._mmap = data
+        return table
+
+    def close(self):
+        """Close the mapped file of a table from open."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._key_count
+
+    def _find(self, value, _unpack_slot=_shared_slot.unpack_from,
+              _slot_size=_shared_slot.size, _crc32=zlib.crc32):
+        if type(value) is self.enum_class:
+            # like looking up in the enum
+            return value
+        if self._fold is not None:
+            value = self._fold(value)
+        if type(value) is six.text_type:
+            key = b's' + value.encode('utf-8', 'surrogatepass')
+        else:
+            key = _shared_key(value)
+            if key is None:
+                return None
+        buffer = self._buffer
+        mask = self._mask
+        code = _crc32(key) & 0xffffffff
+        index = code & mask
+        while True:
+            slot_code, ordinal, offset, length = _unpack_slot(
+                buffer, _shared_header.size + index * _slot_size)
+            if not ordinal:
+                return None
+            if (slot_code == code and length == len(key) and
+                    buffer[offset:offset + length] == key):
+                return self._members[ordinal - 1]
+            index = (index + 1) & mask
+
+    def __call__(self, value):
+        """Return the member for value, raise ValueError if there is none."""
+        member = self._find(value)
+        if member is None:
+            raise ValueError('{!r} is not a valid {}'.format(
+                value, self.enum_class.__name__))
+        return member
+
+    def get(self, value, default=None):
+        """Return the member for value or default."""
+        member = self._find(value)
+        if member is None:
+            return default
+        return member
+
+    def __contains__(self, value):
+        return self._find(value) is not None
+
+    def lookup_many(self, values, default=None, ordinals=False):
+        """Same as lookup_many of MultiValueEnum."""
+        find = self._find
+        results = []
+        misses = []
+        append = results.append
+        for position, value in enumerate(values):
+            member = find(value)
+            if member is None:
+                misses.append(position)
+                append(default)
+            elif ordinals:
+                append(member._ordinal_)
+            else:
+                append(member)
+        return results, misses
+
+    def __repr__(self):
+        return '<SharedAliasTable of {} with {} aliases>'.format(
+            self.enum_class.__name__, self._key_count)
+
+
+def _fold_char(char):
+    # folding one character at a time keeps the offsets of the text
+    folded = char.upper()
+    return folded if len(folded) == 1 else char
+
+
+def _is_word_char(char):
+    if isinstance(char, int):
+        # bytes on Python 3
+        return (48 <= char <= 57 or 65 <= char <= 90 or 97 <= char <= 122 or
+                char == 95)
+    return char.isalnum() or char == '_'
+
+
+class _Automaton(object):
+    """Aho-Corasick automaton of (pattern, member) pairs."""
+    __slots__ = ('goto', 'fail', 'outputs', 'max_length')
+
+    def __init__(self, patterns):
+        goto = [{}]
+        # (pattern length, member) of every pattern ending in the state
+        outputs = [()]
+        self.max_length = 0
+        for pattern, member in patterns:
+            state = 0
+            for symbol in pattern:
+                next_state = goto[state].get(symbol)
+                if next_state is None:
+                    next_state = goto[state][symbol] = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            # the same pattern more times: the first declared wins
+            if not outputs[state]:
+                outputs[state] = ((len(pattern), member),)
+                self.max_length = max(self.max_length, len(pattern))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and symbol not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(symbol, 0)
+                fail[next_state] = target if target != next_state else 0
+                # longer patterns first, then the ones ending the same place
+                outputs[next_state] += outputs[fail[next_state]]
+        self.goto = goto
+        self.fail = fail
+        self.outputs = outputs
+
+
+class AliasScanner(object):
+    """Finds every occurrence of the str or bytes aliases of an enum in text,
+    in one pass over the text with an Aho-Corasick automaton. In bytes, str
+    aliases are matched in the __encoding__ of the class, like get_bytes.
+    Case-insensitive enums match case-insensitively, only ASCII letters in
+    bytes. With whole_words=True, only matches not surrounded by letters,
+    digits or underscore are found.
+    """
+    def __init__(self, enum_class, whole_words=False):
+        self.enum_class = enum_class
+        self.whole_words = whole_words
+        self._fold = getattr(enum_class, '_fold_alias', None) is not None
+        self._automatons = {}
+        self._value_map = None
+
+    def _automaton(self, text):
+        if self._value_map is not self.enum_class._value2member_map_:
+            # made again after load_aliases swapped the table
+            self._automatons = {}
+        try:
+            return self._automatons[text]
+        except KeyError:
+            pass
+        _ensure_indexed(self.enum_class)
+        self._value_map = self.enum_class._value2member_map_
+        if text:
+            aliases = self._value_map.items()
+        else:
+            # bytes aliases and the encoded str aliases
+            aliases = _bytes_index(self.enum_class).items()
+        alias_type = six.text_type if text else bytes
+        patterns = []
+        for alias, member in aliases:
+            if not isinstance(alias, alias_type) or not alias:
+                continue
+            if not text:
+                # bytes.upper() only changes ASCII letters, like in chunks
+                alias = tuple(six.iterbytes(alias.upper() if self._fold else alias))
+            elif self._fold:
+                alias = ''.join(map(_fold_char, alias))
+            patterns.append((alias, member))
+        automaton = self._automatons[text] = _Automaton(patterns)
+        return automaton
+
+    def scan(self, text):
+        """Yield (start, end, member) for every alias in text (str or bytes),
+        ordered by end, longer matches first at the same end.
+        """
+        return self.scan_chunks((text,))
+
+    def scan_file(self, file, chunk_size=1 << 16):
+        """Same as scan for the content of a file opened in text or binary
+        mode, read in chunks. Offsets are counted in characters or bytes.
+        """
+        return self.scan_chunks(iter(partial(file.read, chunk_size), file.read(0)))
+
+    def scan_chunks(self, chunks):
+        """Same as scan for text split into chunks, matches can span chunks.
+        Offsets are counted from the start of the first chunk.
+        """
+        automaton = None
+        text = None
+        state = 0
+        offset = 0
+        # end of the text scanned earlier, to check the start of whole words
+        previous = None
+        # whole word matches at the end of the previous chunk
+        pending = []
+        for chunk in chunks:
+            if automaton is None:
+                text = isinstance(chunk, six.text_type)
+                automaton = self._automaton(text)
+                goto, fail, outputs = automaton.goto, automaton.fail, automaton.outputs
+                previous = chunk[:0]
+            elif isinstance(chunk, six.text_type) != text:
+                raise TypeError('Can not mix str and bytes chunks')
+            if not chunk:
+                continue
+            if text:
+                symbols = chunk.upper() if self._fold else chunk
+                if len(symbols) != len(chunk):
+                    symbols = ''.join(map(_fold_char, chunk))
+            else:
+                symbols = six.iterbytes(chunk.upper() if self._fold else chunk)
+            window = previous + chunk
+            window_start = offset - len(previous)
+            if pending:
+                if not _is_word_char(window[offset - window_start]):
+                    for match in pending:
+                        yield match
+                pending = []
+            chunk_end = offset + len(chunk)
+            position = offset
+            for symbol in symbols:
+                position += 1
+                while state and symbol not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(symbol, 0)
+                if not outputs[state]:
+                    continue
+                for length, member in outputs[state]:
+                    start = position - length
+                    if self.whole_words:
+                        if start and _is_word_char(window[start - 1 - window_start]):
+                            continue
+                        if position == chunk_end:
+                            pending.append((start, position, member))
+                            continue
+                        if _is_word_char(window[position - window_start]):
+                            continue
+                    yield start, position, member
+            offset = chunk_end
+            previous = window[-automaton.max_length:] if automaton.max_length else chunk[:0]
+        for match in pending:
+            yield match
+
+
+# NumPy is optional, only needed for encode_array and decode_array
+_array_tables = _ClassCache('_array_tables_')
+
+
+def _get_array_tables(enum_class):
+    """Build (and cache) the sorted key tables of a MultiValueEnum used for
+    vectorized lookups. For int, float (ints included), str and bytes aliases,
+    it is an array of sorted aliases and an array of the matching member
+    ordinals.
+    """
+    tables = _cached_table(_array_tables, enum_class)
+    if tables is not None:
+        return tables
+
+    import numpy
+
+    _ensure_indexed(enum_class)
+    value_map = enum_class._value2member_map_
+
+    int_items, float_items, text_items, bytes_items = [], [], [], []
+    for alias, member in value_map.items():
+        if isinstance(alias, Real) and not isinstance(alias, Integral):
+            if not isinstance(alias, float) or alias != alias:
+                # Fractions and Decimals, NaN is not equal to anything
+                continue
+            float_items.append((alias, member._ordinal_))
+            if alias.is_integer() and -2 ** 63 <= alias < 2 ** 63:
+                # equal to the same int
+                int_items.append((int(alias), member._ordinal_))
+        elif isinstance(alias, Integral) and -2 ** 63 <= alias < 2 ** 63:
+            int_items.append((int(alias), member._ordinal_))
+            if -2 ** 53 <= alias <= 2 ** 53:
+                # exactly representable as float
+                float_items.append((float(alias), member._ordinal_))
+        elif isinstance(alias, six.text_type):
+            text_items.append((alias, member._ordinal_))
+        elif isinstance(alias, bytes):
+            bytes_items.append((alias, member._ordinal_))
+
+    def make_table(items, dtype):
+        items.sort()
+        keys = numpy.array([key for key, _ in items], dtype=dtype)
+        ordinals = numpy.array([ordinal for _, ordinal in items], dtype=numpy.intp)
+        return keys, ordinals
+
+    tables = {
+        'i': make_table(int_items, numpy.int64),
+        'f': make_table(float_items, numpy.float64),
+        'U': make_table(text_items, numpy.str_),
+        'S': make_table(bytes_items, numpy.bytes_),
+        'interval': None,
+        'interval_fallback': None,
+        'dense': None,
+    }
+    dense = _dense_int_table(value_map)
+    if dense is not None:
+        first, members = dense
+        tables['dense'] = (first, numpy.array(
+            [-1 if member is None else member._ordinal_ for member in members],
+            dtype=numpy.intp))
+
+    def make_interval_table(intervals):
+        pieces = [piece for piece, _ in intervals.pieces]
+        return (
+            numpy.array([piece.start for piece in pieces]),
+            numpy.array([piece.stop for piece in pieces]),
+            numpy.array([isinstance(piece, _IntRange) for piece in pieces]),
+            numpy.array([member._ordinal_ for _, member in intervals.pieces],
+                        dtype=numpy.intp),
+        )
+
+    intervals = enum_class._interval_table_
+    if intervals is not None:
+        tables['interval'] = make_interval_table(intervals)
+        if intervals.fallback is not None:
+            tables['interval_fallback'] = make_interval_table(intervals.fallback)
+    return _cache_table(_array_tables, enum_class, value_map, tables)
+
+
+def _encode_intervals(interval_table, values, codes, found):
+    # values not found as discrete aliases, but in an interval
+    import numpy
+
+    starts, stops, integral, ordinals = interval_table
+    positions = numpy.searchsorted(starts, values, side='right') - 1
+    inside = positions >= 0
+    numpy.maximum(positions, 0, out=positions)
+    inside &= ~found & (values < stops[positions])
+    inside &= ~integral[positions] | (values == numpy.floor(values))
+    return numpy.where(inside, ordinals[positions], codes), found | inside
+
+
+def encode_array(enum_class, values, missing=-1):
+    """Vectorized lookup of a MultiValueEnum or CaseInsensitiveMultiValueEnum.
+    Converts an array of aliases (numbers, fixed-width str or bytes, or any
+    object) to an array of member ordinals. Values not found will be missing.
+    Requires NumPy.
+    """
+    import numpy
+
+    values = raw_values = numpy.asarray(values)
+    if values.dtype.kind == 'b':
+        values = values.astype(numpy.int64)
+    kind = values.dtype.kind
+    if kind in 'iuf':
+        keys, ordinals = _get_array_tables(enum_class)['f' if kind == 'f' else 'i']
+        if kind == 'u' and values.dtype.itemsize == 8:
+            # uint64 can't be compared safely with int64 keys
+            values = values.astype(object)
+            kind = 'O'
+    elif kind in 'US':
+        keys, ordinals = _get_array_tables(enum_class)[kind]
+        if enum_class._fold_alias is _fold_text and kind == 'U':
+            values = numpy.char.upper(values)
+    else:
+        kind = 'O'
+
+    if kind == 'O':
+        codes, _ = enum_class.lookup_many(values.ravel().tolist(),
+                                          default=missing, ordinals=True)
+        return numpy.array(codes, dtype=numpy.intp).reshape(values.shape)
+
+    dense = _get_array_tables(enum_class)['dense']
+    if kind in 'iu' and dense is not None:
+        # direct addressing instead of a binary search
+        first, dense_ordinals = dense
+        positions = values.astype(numpy.int64) - first
+        inside = (positions >= 0) & (positions < len(dense_ordinals))
+        codes = dense_ordinals[numpy.where(inside, positions, 0)]
+        found = inside & (codes >= 0)
+        codes = numpy.where(found, codes, missing)
+    elif len(keys):
+        positions = numpy.searchsorted(keys, values)
+        numpy.minimum(positions, len(keys) - 1, out=positions)
+        found = keys[positions] == values
+        codes = numpy.where(found, ordinals[positions], missing)
+    else:
+        found = numpy.zeros(values.shape, dtype=bool)
+        codes = numpy.full(values.shape, missing, dtype=numpy.intp)
+
+    tables = _get_array_tables(enum_class)
+    if kind in 'iuf' and tables['interval'] is not None:
+        codes, found = _encode_intervals(tables['interval'], values, codes, found)
+        if tables['interval_fallback'] is not None:
+            # numbers under a range, which are not integers
+            codes, found = _encode_intervals(tables['interval_fallback'],
+                                             values, codes, found)
+    if getattr(enum_class, '__normalizers__', None):
+        # values which are found only after normalizing
+        unresolved = numpy.flatnonzero(codes == missing)
+        if len(unresolved):
+            codes = codes.ravel()
+            codes[unresolved], _ = enum_class.lookup_many(
+                raw_values.ravel()[unresolved].tolist(), default=missing,
+                ordinals=True)
+            codes = codes.reshape(values.shape)
+    return codes
+
+
+def decode_array(enum_class, codes, to='member', missing=None, missing_code=-1):
+    """Reverse of encode_array: convert an array of member ordinals to an
+    object array of members, their names (to='name') or their canonical value,
+    the first element of their value (to='value'). missing_code codes (the
+    missing of encode_array) become missing, other codes which are not
+    ordinals raise ValueError.
+    Requires NumPy.
+    """
+    import numpy
+
+    if to not in ('member', 'name', 'value'):
+        raise ValueError("to should be 'member', 'name' or 'value', not {!r}"
+                         .format(to))
+    members = list(_members_by_ordinal(enum_class))
+    if to == 'name':
+        table = [member._name_ for member in members]
+    elif to == 'value':
+        table = [_canonical(member) for member in members]
+    else:
+        table = members
+    member_count = len(members)
+    codes = numpy.asarray(codes, dtype=numpy.intp)
+    is_missing = codes == missing_code
+    invalid = ~is_missing & ((codes < 0) | (codes >= member_count))
+    if invalid.any():
+        raise ValueError('{} is not a valid ordinal of {}'.format(
+            codes[invalid].ravel()[0], enum_class.__name__))
+    # missing is at the end, indexed by the missing codes
+    table.append(missing)
+    lookup_table = numpy.empty(len(table), dtype=object)
+    # assigning one by one, so numpy doesn't try to broadcast iterable values
+    for index, item in enumerate(table):
+        lookup_table[index] = item
+    return lookup_table[numpy.where(is_missing, member_count, codes)]
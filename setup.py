@@ -26,5 +26,6 @@ setup(
     license='MIT',
     py_modules=['enum_custom'],
     install_requires=['enum34', 'six'] if sys.version_info[0] < 3 else ['enum34'],
+    extras_require={'numpy': ['numpy']},
     tests_require=['pytest', 'pytest-raisesregexp'],
 )
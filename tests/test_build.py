@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import gc
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+import weakref
+import pytest
+from pytest import raises
+import enum_custom
+from enum_custom import (MultiValueEnum, CaseInsensitiveMultiValueEnum,
+                         Interval, build_enum)
+
+
+SUITS = {'CLUBS': ['c', 'C'], 'DIAMONDS': ['d', 'D']}
+
+
+@pytest.fixture
+def source(tmpdir):
+    path = str(tmpdir.join('suits.json'))
+    with io.open(path, 'w', encoding='utf-8') as source_file:
+        source_file.write(json.dumps(SUITS, sort_keys=True))
+    return path
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return str(tmpdir.join('suits.cache'))
+
+
+def test_from_mapping():
+    Suit = build_enum('Suit', SUITS)
+    assert issubclass(Suit, MultiValueEnum)
+    assert Suit('C') is Suit.CLUBS
+    assert Suit.DIAMONDS.value == ('d', 'D')
+
+
+def test_from_file(source):
+    Suit = build_enum('Suit', source)
+    assert [member.name for member in Suit] == ['CLUBS', 'DIAMONDS']
+    assert Suit('d') is Suit.DIAMONDS
+
+
+def test_values_are_checked():
+    with raises(TypeError):
+        build_enum('Suit', {'CLUBS': 'c'})
+
+
+def test_check_overlap():
+    with raises(ValueError):
+        build_enum('Suit', {'A': [1, 2], 'B': [2]}, check_overlap=True)
+    with raises(ValueError):
+        build_enum('Suit', {'A': ['a'], 'B': ['A']},
+                   base=CaseInsensitiveMultiValueEnum, check_overlap=True)
+
+
+def test_cached_tables_are_loaded(source, cache, monkeypatch):
+    build_enum('Suit', source, cache=cache, check_overlap=True)
+
+    def fail(*args, **kwds):
+        raise AssertionError('should not be computed again')
+
+    monkeypatch.setattr(enum_custom, 'no_overlap', fail)
+    monkeypatch.setattr(enum_custom, '_dump_tables', fail)
+    Suit = build_enum('Suit', source, cache=cache, check_overlap=True)
+    assert Suit('c') is Suit.CLUBS
+    assert Suit('D') is Suit.DIAMONDS
+    assert Suit.get('x') is None
+    assert Suit.CLUBS.value == ('c', 'C')
+
+
+def test_changed_source_invalidates_cache(source, cache):
+    build_enum('Suit', source, cache=cache)
+    with io.open(source, 'w', encoding='utf-8') as source_file:
+        source_file.write(json.dumps({'CLUBS': ['x']}))
+    Suit = build_enum('Suit', source, cache=cache)
+    assert Suit('x') is Suit.CLUBS
+    assert Suit.get('c') is None
+
+
+def test_generator_and_set_values_are_cached(cache, monkeypatch):
+    def source():
+        return {'A': (alias for alias in ['x', 'y']), 'B': {'z', 'w', 'v'}}
+
+    build_enum('Suit', source(), cache=cache)
+
+    def fail(*args, **kwds):
+        raise AssertionError('should not be computed again')
+
+    monkeypatch.setattr(enum_custom, '_dump_tables', fail)
+    Suit = build_enum('Suit', source(), cache=cache)
+    assert Suit.B.value == ('v', 'w', 'z')
+    assert Suit('w') is Suit.B
+
+
+def test_set_values_are_the_same_in_every_process(cache):
+    script = ('from enum_custom import build_enum\n'
+              'Suit = build_enum("Suit", {"A": {"x", "y", "z"}}, cache=%r)\n'
+              'print(Suit.A.value)' % cache)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        [os.path.dirname(enum_custom.__file__)] + sys.path))
+    outputs = []
+    inodes = []
+    for seed in ('1', '2', '3'):
+        env['PYTHONHASHSEED'] = seed
+        outputs.append(subprocess.check_output([sys.executable, '-c', script],
+                                               env=env))
+        inodes.append(os.stat(cache).st_ino)
+    assert len(set(outputs)) == 1
+    # written once, later processes load it
+    assert len(set(inodes)) == 1
+
+
+def test_unordered_values_can_not_be_cached(cache):
+    with raises(TypeError):
+        build_enum('Suit', {'A': {1, 'one'}}, cache=cache)
+    assert build_enum('Suit', {'A': {1, 'one'}})(1).name == 'A'
+
+
+def test_case_insensitive_cached(cache):
+    for _ in range(2):
+        Suit = build_enum('Suit', SUITS, base=CaseInsensitiveMultiValueEnum,
+                          cache=cache)
+        assert Suit('c') is Suit.CLUBS
+        assert Suit('clubs'[0].upper()) is Suit.CLUBS
+        assert Suit('c') is Suit('C')
+
+
+def test_intervals_cached(cache):
+    source = {'LOW': [range(0, 10), 'low'], 'HIGH': Interval(10, 20.5)}
+    for _ in range(2):
+        Level = build_enum('Level', source, cache=cache)
+        assert Level(5) is Level.LOW
+        assert Level(20.25) is Level.HIGH
+        assert Level.get(10.5) is Level.HIGH
+        assert Level('low') is Level.LOW
+
+
+def test_interval_under_range_cached(cache):
+    source = {'LOW': range(0, 10), 'HIGH': Interval(5.5, 20)}
+    for _ in range(2):
+        Level = build_enum('Level', source, cache=cache)
+        assert Level(5) is Level.LOW
+        assert Level(5.5) is Level.HIGH
+        assert Level.get(2.5) is None
+
+
+def test_corrupt_cache_is_ignored(cache):
+    with open(cache, 'wb') as cache_file:
+        cache_file.write(b'garbage')
+    Suit = build_enum('Suit', SUITS, cache=cache)
+    assert Suit('c') is Suit.CLUBS
+
+
+def test_built_classes_are_collected():
+    Suit = build_enum('Suit', SUITS)
+    assert Suit('c') is Suit.CLUBS
+    assert Suit.get_bytes(b'd') is Suit.DIAMONDS
+    assert Suit.completions('c') == ['c']
+    assert Suit.CLUBS.aliases == {'c', 'C'}
+    Suit.load_aliases({'CLUBS': ['club']})
+    suit_ref = weakref.ref(Suit)
+    del Suit
+    gc.collect()
+    assert suit_ref() is None
+
+
+def test_pickle():
+    dumped = pickle.dumps(BuiltSuit.CLUBS)
+    assert pickle.loads(dumped) is BuiltSuit.CLUBS
+
+
+BuiltSuit = build_enum('BuiltSuit', SUITS)
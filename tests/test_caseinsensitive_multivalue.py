@@ -2,7 +2,9 @@
 from __future__ import unicode_literals
 
 import six
-from enum_custom import CaseInsensitiveMultiValueEnum, OrderableMixin
+from pytest import raises
+from enum_custom import (CaseInsensitiveMultiValueEnum, OrderableMixin,
+                         no_overlap)
 
 
 class MyInsensitiveMVE(CaseInsensitiveMultiValueEnum):
@@ -38,3 +40,69 @@ def test_orderable():
 
     assert OrderableInsensitiveMVE.one < OrderableInsensitiveMVE.two
     assert OrderableInsensitiveMVE.two < OrderableInsensitiveMVE.three
+
+
+def test_lookup_many_is_case_insensitive():
+    results, misses = MyInsensitiveMVE.lookup_many(['ONE', 'two', 2, 'four'])
+    assert results == [MyInsensitiveMVE.one, MyInsensitiveMVE.two,
+                       MyInsensitiveMVE.two, None]
+    assert misses == [3]
+
+
+def test_get_and_contains():
+    assert MyInsensitiveMVE.get('THREE') is MyInsensitiveMVE.three
+    assert MyInsensitiveMVE.get('four') is None
+    assert 'ONe' in MyInsensitiveMVE
+    assert 4 not in MyInsensitiveMVE
+
+
+def test_error_shows_folded_value():
+    with raises(ValueError) as excinfo:
+        MyInsensitiveMVE('four')
+    assert 'FOUR' in str(excinfo.value)
+
+
+def test_no_overlap_after_case_folding():
+    with raises(ValueError):
+        @no_overlap(case_insensitive=True)
+        class MyOverlappingInsensitiveMVE(CaseInsensitiveMultiValueEnum):
+            A = 1, 'one'
+            B = 2, 'ONE'
+
+    @no_overlap(case_insensitive=True)
+    class MyInsensitiveMVE(CaseInsensitiveMultiValueEnum):
+        A = 1, 'one'
+        B = 2, 'two'
+
+    assert MyInsensitiveMVE('TWO') is MyInsensitiveMVE.B
+
+
+def test_from_prefix_is_case_insensitive():
+    assert MyInsensitiveMVE.from_prefix('Thr') is MyInsensitiveMVE.three
+    assert MyInsensitiveMVE.completions('t') == ['THREE', 'TWO']
+
+
+def test_get_bytes_folds_ascii():
+    assert MyInsensitiveMVE.get_bytes(b'thrEE') is MyInsensitiveMVE.three
+    assert MyInsensitiveMVE.lookup_bytes_many(b'one two', [(0, 3), (4, 7)]) == \
+        ([MyInsensitiveMVE.one, MyInsensitiveMVE.two], [])
+
+
+def test_member_contains_folds_case():
+    assert 'Three' in MyInsensitiveMVE.three
+    assert 'THREE' in MyInsensitiveMVE.three
+    assert 'one' not in MyInsensitiveMVE.three
+    assert MyInsensitiveMVE.three.aliases == frozenset([3, 'THREE'])
+    assert MyInsensitiveMVE.alias_index()[MyInsensitiveMVE.three] == \
+        frozenset([3, 'THREE'])
+
+
+def test_load_aliases_folds_case():
+    class MyReloadableInsensitiveMVE(CaseInsensitiveMultiValueEnum):
+        one = 1, 'one'
+        two = 2, 'two'
+
+    MyReloadableInsensitiveMVE.load_aliases({'one': ['Uno']})
+    assert MyReloadableInsensitiveMVE('UNO') is MyReloadableInsensitiveMVE.one
+    with raises(ValueError):
+        MyReloadableInsensitiveMVE.load_aliases({'one': ['TWO']})
@@ -38,3 +38,63 @@ def test_comparison_will_happen_based_on_str_value():
 def test_case_insensitivity():
     assert MyCaseInsensitiveStrEnum('a') == 'A'
     assert MyCaseInsensitiveStrEnum('A') == 'a'
+
+
+def test_not_equal():
+    assert MyCaseInsensitiveStrEnum.one != 'b'
+    assert not MyCaseInsensitiveStrEnum.one != 'a'
+    assert MyCaseInsensitiveStrEnum.one != MyCaseInsensitiveStrEnum.two
+
+
+def test_not_comparable_to_other_types():
+    assert MyCaseInsensitiveStrEnum.one != 1
+    assert not MyCaseInsensitiveStrEnum.one == None  # noqa
+
+
+def test_lookup_returns_the_same_member():
+    assert MyCaseInsensitiveStrEnum('B') is MyCaseInsensitiveStrEnum.two
+    assert MyCaseInsensitiveStrEnum('b') is MyCaseInsensitiveStrEnum.two
+    with raises(ValueError):
+        MyCaseInsensitiveStrEnum('c')
+
+
+def test_hashable():
+    members = {MyCaseInsensitiveStrEnum.one: 1, MyCaseInsensitiveStrEnum.two: 2}
+    assert members[MyCaseInsensitiveStrEnum('a')] == 1
+    # the folded value is the same key
+    assert members['B'] == 2
+    assert len({MyCaseInsensitiveStrEnum.one, MyCaseInsensitiveStrEnum('A')}) == 1
+
+
+def test_get():
+    assert MyCaseInsensitiveStrEnum.get('a') is MyCaseInsensitiveStrEnum.one
+    assert MyCaseInsensitiveStrEnum.get('B') is MyCaseInsensitiveStrEnum.two
+    assert MyCaseInsensitiveStrEnum.get('c') is None
+    assert MyCaseInsensitiveStrEnum.get(None, 'missing') == 'missing'
+
+
+def test_contains():
+    assert 'a' in MyCaseInsensitiveStrEnum
+    assert 'A' in MyCaseInsensitiveStrEnum
+    assert MyCaseInsensitiveStrEnum.two in MyCaseInsensitiveStrEnum
+    assert 'c' not in MyCaseInsensitiveStrEnum
+
+
+def test_from_prefix():
+    assert MyCaseInsensitiveStrEnum.from_prefix('O') is MyCaseInsensitiveStrEnum.one
+    assert MyCaseInsensitiveStrEnum.completions('A') == ['A']
+
+
+def test_get_bytes():
+    assert MyCaseInsensitiveStrEnum.get_bytes(b'a') is MyCaseInsensitiveStrEnum.one
+    assert MyCaseInsensitiveStrEnum.get_bytes(bytearray(b'B')) is \
+        MyCaseInsensitiveStrEnum.two
+
+
+def test_hash_matches_only_the_folded_value():
+    # equal in any case, but a str subclass can't hash case insensitively
+    members = {MyCaseInsensitiveStrEnum.one: 1}
+    assert MyCaseInsensitiveStrEnum.one == 'a'
+    assert hash(MyCaseInsensitiveStrEnum.one) == hash('A')
+    assert members.get('A') == 1
+    assert members.get('a') is None
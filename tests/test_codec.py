@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from enum import Enum
+from pytest import raises
+from enum_custom import (MultiValueEnum, schema_fingerprint, encode_member,
+                         decode_member, encode_members, decode_members)
+
+
+class Suit(MultiValueEnum):
+    CLUBS = 'c', 'C'
+    DIAMONDS = 'd', 'D'
+    HEARTS = 'h', 'H'
+
+
+Big = Enum('Big', ['M{}'.format(n) for n in range(300)])
+
+
+def test_member_round_trip():
+    data = encode_member(Suit.HEARTS)
+    assert len(data) == 9 + 1
+    assert decode_member(Suit, data) is Suit.HEARTS
+
+
+def test_member_without_header():
+    assert encode_member(Suit.DIAMONDS, header=False) == b'\x01'
+    assert decode_member(Suit, b'\x02', header=False) is Suit.HEARTS
+
+
+def test_width_fits_every_ordinal():
+    assert encode_member(Big.M299, header=False) == b'\x2b\x01'
+    assert decode_member(Big, encode_member(Big.M299)) is Big.M299
+
+
+def test_members_round_trip():
+    members = [Suit.HEARTS, Suit.CLUBS, Suit.HEARTS]
+    data = encode_members(Suit, members)
+    assert data[9:] == b'\x02\x00\x02'
+    decoded = decode_members(Suit, data)
+    assert len(decoded) == 3
+    assert list(decoded) == members
+    assert decoded[0] is Suit.HEARTS
+    assert decoded[-1] is Suit.HEARTS
+    assert decoded[1:] == [Suit.CLUBS, Suit.HEARTS]
+
+
+def test_wide_members_round_trip():
+    members = [Big.M0, Big.M299, Big.M256]
+    assert list(decode_members(Big, encode_members(Big, members))) == members
+
+
+def test_decode_from_memoryview():
+    data = bytearray(encode_members(Suit, [Suit.CLUBS, Suit.DIAMONDS]))
+    decoded = decode_members(Suit, memoryview(data))
+    data[-1] = 2
+    # not copied
+    assert list(decoded) == [Suit.CLUBS, Suit.HEARTS]
+
+
+def test_empty():
+    assert list(decode_members(Suit, encode_members(Suit, []))) == []
+
+
+def test_only_members_of_the_enum():
+    with raises(TypeError):
+        encode_members(Suit, [Suit.CLUBS, Big.M0])
+
+
+def test_mismatched_definition():
+    class Suit(MultiValueEnum):
+        DIAMONDS = 'd', 'D'
+        CLUBS = 'c', 'C'
+        HEARTS = 'h', 'H'
+
+    assert schema_fingerprint(Suit) != schema_fingerprint(globals()['Suit'])
+    with raises(ValueError):
+        decode_member(Suit, encode_member(globals()['Suit'].CLUBS))
+    with raises(ValueError):
+        decode_members(Suit, encode_members(globals()['Suit'], []))
+
+
+def test_invalid_data():
+    with raises(ValueError):
+        decode_member(Suit, b'\x07', header=False)
+    with raises(ValueError):
+        decode_members(Suit, b'\x01\x07', header=False)
+    with raises(ValueError):
+        decode_members(Big, b'\x01\x00\x02', header=False)
+    with raises(ValueError):
+        decode_members(Suit, b'\x01')
+
+
+def test_member_too_short():
+    with raises(ValueError):
+        decode_member(Suit, b'', header=False)
+    with raises(ValueError):
+        decode_member(Big, b'\x01', header=False)
+    with raises(ValueError):
+        decode_member(Suit, encode_member(Suit.CLUBS)[:-1])
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import operator
+import pickle
+from enum import Enum
+from pytest import raises
+from enum_custom import MultiValueEnum, StrEnum, EnumMap, EnumCounter
+
+
+class Suit(MultiValueEnum):
+    CLUBS = 'c', 'C'
+    DIAMONDS = 'd', 'D'
+    HEARTS = 'h', 'H'
+    SPADES = 's', 'S'
+
+
+class Color(Enum):
+    RED = 1
+    GREEN = 2
+
+
+class Letter(StrEnum):
+    a = 'a'
+    b = 'b'
+
+
+class TestEnumMap:
+    def test_dict_api(self):
+        suits = EnumMap(Suit, {Suit.HEARTS: 'red', Suit.CLUBS: 'black'})
+        assert suits[Suit.HEARTS] == 'red'
+        assert suits.get(Suit.SPADES) is None
+        assert Suit.CLUBS in suits
+        assert Suit.SPADES not in suits
+        assert len(suits) == 2
+        del suits[Suit.CLUBS]
+        assert list(suits) == [Suit.HEARTS]
+        assert suits.pop(Suit.HEARTS) == 'red'
+        assert not suits
+
+    def test_missing_keys(self):
+        suits = EnumMap(Suit)
+        with raises(KeyError):
+            suits[Suit.CLUBS]
+        with raises(KeyError):
+            suits['c']
+        with raises(KeyError):
+            del suits[Suit.CLUBS]
+        assert Color.RED not in suits
+
+    def test_only_members_of_the_enum(self):
+        with raises(TypeError):
+            EnumMap(Suit)[Color.RED] = 1
+        with raises(TypeError):
+            EnumMap(Suit)['c'] = 1
+
+    def test_definition_order(self):
+        suits = EnumMap(Suit, [(Suit.SPADES, 4), (Suit.CLUBS, 1)])
+        assert list(suits.keys()) == [Suit.CLUBS, Suit.SPADES]
+        assert list(suits.values()) == [1, 4]
+        assert suits.items() == [(Suit.CLUBS, 1), (Suit.SPADES, 4)]
+
+    def test_none_can_be_a_value(self):
+        suits = EnumMap(Suit, {Suit.CLUBS: None})
+        assert Suit.CLUBS in suits
+        assert suits[Suit.CLUBS] is None
+
+    def test_update_values(self):
+        suits = EnumMap(Suit)
+        misses = suits.update_values([('c', 1), ('x', 2), ('H', 3)])
+        assert misses == [1]
+        assert suits == {Suit.CLUBS: 1, Suit.HEARTS: 3}
+
+    def test_update_values_any_enum(self):
+        letters = EnumMap(Letter)
+        assert letters.update_values([('b', 1), ('x', 2)]) == [1]
+        assert letters == {Letter.b: 1}
+
+    def test_merge(self):
+        first = EnumMap(Suit, {Suit.CLUBS: 1, Suit.HEARTS: 2})
+        second = EnumMap(Suit, {Suit.HEARTS: 10, Suit.SPADES: 20})
+        first.merge(second, operator.add)
+        assert first == {Suit.CLUBS: 1, Suit.HEARTS: 12, Suit.SPADES: 20}
+        with raises(TypeError):
+            first.merge(EnumMap(Color), operator.add)
+
+    def test_equality(self):
+        assert EnumMap(Suit, {Suit.CLUBS: 1}) == EnumMap(Suit, {Suit.CLUBS: 1})
+        assert EnumMap(Suit, {Suit.CLUBS: 1}) != EnumMap(Suit, {Suit.CLUBS: 2})
+        assert EnumMap(Color) != EnumMap(Suit, {Suit.CLUBS: 1})
+
+    def test_pickle(self):
+        suits = EnumMap(Suit, {Suit.CLUBS: 1, Suit.SPADES: [2]})
+        assert pickle.loads(pickle.dumps(suits)) == suits
+
+    def test_repr(self):
+        assert repr(EnumMap(Color, {Color.GREEN: 2})) == \
+            'EnumMap(Color, {<Color.GREEN: 2>: 2})'
+
+
+class TestEnumCounter:
+    def test_count(self):
+        counter = EnumCounter(Suit, [Suit.CLUBS, Suit.HEARTS, Suit.CLUBS])
+        assert counter[Suit.CLUBS] == 2
+        assert counter[Suit.SPADES] == 0
+        assert Suit.SPADES not in counter
+        assert list(counter) == [Suit.CLUBS, Suit.HEARTS]
+        assert len(counter) == 2
+        assert counter.total() == 3
+
+    def test_update(self):
+        counter = EnumCounter(Suit)
+        counter.update({Suit.CLUBS: 3})
+        counter.update([Suit.CLUBS])
+        counter[Suit.SPADES] += 1
+        assert counter == {Suit.CLUBS: 4, Suit.SPADES: 1}
+        del counter[Suit.CLUBS]
+        assert counter == {Suit.SPADES: 1}
+
+    def test_members_are_not_hashed(self):
+        hashes = []
+
+        class MyHashedEnum(Enum):
+            a = 1
+            b = 2
+
+            def __hash__(self):
+                hashes.append(self)
+                return hash(self._name_)
+
+        counter = EnumCounter(MyHashedEnum, [MyHashedEnum.a, MyHashedEnum.b] * 10)
+        counter.update([MyHashedEnum.a] * 10)
+        assert counter[MyHashedEnum.a] == 20
+        assert hashes == []
+        with raises(TypeError):
+            counter.update([MyHashedEnum.a, 'a'])
+        # nothing is counted from an invalid iterable
+        assert counter[MyHashedEnum.a] == 20
+
+    def test_update_values(self):
+        counter = EnumCounter(Suit)
+        assert counter.update_values(['c', 'C', 'x', 'h', 'c']) == [2]
+        assert counter.most_common() == [(Suit.CLUBS, 3), (Suit.HEARTS, 1)]
+        assert counter.most_common(1) == [(Suit.CLUBS, 3)]
+
+    def test_merge(self):
+        first = EnumCounter(Suit, [Suit.CLUBS])
+        second = EnumCounter(Suit, [Suit.CLUBS, Suit.SPADES])
+        assert first + second == {Suit.CLUBS: 2, Suit.SPADES: 1}
+        assert first == {Suit.CLUBS: 1}
+        first += second
+        assert first == {Suit.CLUBS: 2, Suit.SPADES: 1}
+        with raises(TypeError):
+            first.merge(EnumCounter(Color))
+
+    def test_pickle(self):
+        counter = EnumCounter(Suit, [Suit.CLUBS, Suit.SPADES, Suit.SPADES])
+        assert pickle.loads(pickle.dumps(counter)) == counter
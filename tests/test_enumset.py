@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pickle
+from enum import Enum
+from pytest import raises
+from enum_custom import MultiValueEnum, StrEnum, EnumSet
+
+
+class Suit(MultiValueEnum):
+    CLUBS = 'c', 'C'
+    DIAMONDS = 'd', 'D'
+    HEARTS = 'h', 'H'
+    SPADES = 's', 'S'
+
+
+class Color(Enum):
+    RED = 1
+    GREEN = 2
+
+
+class Letter(StrEnum):
+    a = 'a'
+    b = 'b'
+
+
+def test_membership():
+    suits = EnumSet(Suit, [Suit.CLUBS, Suit.HEARTS])
+    assert Suit.CLUBS in suits
+    assert Suit.DIAMONDS not in suits
+    assert 'c' not in suits
+    assert Color.RED not in suits
+
+
+def test_iterates_in_definition_order():
+    suits = EnumSet(Suit, [Suit.SPADES, Suit.CLUBS, Suit.HEARTS])
+    assert list(suits) == [Suit.CLUBS, Suit.HEARTS, Suit.SPADES]
+    assert len(suits) == 3
+    assert suits.bits == 0b1101
+
+
+def test_add_discard_remove():
+    suits = EnumSet(Suit)
+    assert not suits
+    suits.add(Suit.DIAMONDS)
+    suits.add(Suit.DIAMONDS)
+    assert list(suits) == [Suit.DIAMONDS]
+    suits.discard(Suit.CLUBS)
+    suits.remove(Suit.DIAMONDS)
+    assert not suits
+    with raises(KeyError):
+        suits.remove(Suit.DIAMONDS)
+
+
+def test_only_members_of_the_enum():
+    with raises(TypeError):
+        EnumSet(Suit, [Color.RED])
+    with raises(TypeError):
+        EnumSet(Suit, ['c'])
+
+
+def test_set_operations():
+    red = EnumSet(Suit, [Suit.DIAMONDS, Suit.HEARTS])
+    low = EnumSet(Suit, [Suit.CLUBS, Suit.DIAMONDS])
+    assert list(red | low) == [Suit.CLUBS, Suit.DIAMONDS, Suit.HEARTS]
+    assert list(red & low) == [Suit.DIAMONDS]
+    assert list(red - low) == [Suit.HEARTS]
+    assert list(red ^ low) == [Suit.CLUBS, Suit.HEARTS]
+    assert list(red.complement()) == [Suit.CLUBS, Suit.SPADES]
+    red |= low
+    assert red == EnumSet(Suit, [Suit.CLUBS, Suit.DIAMONDS, Suit.HEARTS])
+    red -= low
+    assert red == EnumSet(Suit, [Suit.HEARTS])
+
+
+def test_different_enums_can_not_be_combined():
+    with raises(TypeError):
+        EnumSet(Suit) | EnumSet(Color)
+    with raises(TypeError):
+        EnumSet(Suit) | {Suit.CLUBS}
+
+
+def test_comparison():
+    some = EnumSet(Suit, [Suit.CLUBS])
+    assert some < EnumSet.all_of(Suit)
+    assert some <= some
+    assert not some < some
+    assert some.issubset([Suit.CLUBS, Suit.SPADES])
+    assert EnumSet.all_of(Suit).issuperset(some)
+    assert some.isdisjoint([Suit.HEARTS])
+    assert some != EnumSet(Suit)
+    assert EnumSet(Suit) != EnumSet(Color)
+
+
+def test_from_values():
+    suits = EnumSet.from_values(Suit, ['c', 'H', 'h'])
+    assert list(suits) == [Suit.CLUBS, Suit.HEARTS]
+    assert list(EnumSet.from_values(Letter, 'ba')) == [Letter.a, Letter.b]
+    assert list(EnumSet.from_values(Color, [2])) == [Color.GREEN]
+
+
+def test_from_values_missing():
+    with raises(ValueError) as excinfo:
+        EnumSet.from_values(Suit, ['c', 'x', 'y'])
+    assert 'x' in str(excinfo.value)
+
+
+def test_from_bits():
+    assert list(EnumSet.from_bits(Suit, 0b1010)) == [Suit.DIAMONDS, Suit.SPADES]
+    with raises(ValueError):
+        EnumSet.from_bits(Suit, 0b10000)
+
+
+def test_pickle():
+    suits = EnumSet(Suit, [Suit.CLUBS, Suit.SPADES])
+    assert pickle.loads(pickle.dumps(suits)) == suits
+
+
+def test_not_hashable():
+    with raises(TypeError):
+        hash(EnumSet(Suit))
+
+
+def test_repr():
+    assert repr(EnumSet(Color, [Color.RED])) == \
+        'EnumSet(Color, [<Color.RED: 1>])'
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import gc
+import weakref
+import pytest
+from pytest import raises
+import enum_custom
+from enum_custom import (MultiValueEnum, CaseInsensitiveMultiValueEnum,
+                         CaseInsensitiveStrEnum, enable_lookup_stats,
+                         disable_lookup_stats, lookup_stats, reset_lookup_stats)
+
+
+class Suit(MultiValueEnum):
+    CLUBS = 'c', 'C'
+    DIAMONDS = 'd', 'D'
+
+
+class CISuit(CaseInsensitiveMultiValueEnum):
+    CLUBS = 'c', 'clubs'
+
+
+class CIStr(CaseInsensitiveStrEnum):
+    one = 'a'
+
+
+@pytest.fixture(autouse=True)
+def stats():
+    reset_lookup_stats()
+    enable_lookup_stats(max_misses=3)
+    yield
+    disable_lookup_stats()
+    reset_lookup_stats()
+
+
+def test_counts_hits_and_misses():
+    Suit('c')
+    Suit.get('D')
+    Suit.get('x')
+    assert 'y' not in Suit
+    stats = lookup_stats()[Suit]
+    assert stats.hits == 2
+    assert stats.misses == 2
+    assert stats.lookups == 4
+    assert stats.hit_ratio == 0.5
+    assert stats.seconds > 0
+
+
+def test_failed_call_is_one_miss():
+    with raises(ValueError):
+        Suit('x')
+    assert lookup_stats()[Suit].misses == 1
+
+
+def test_every_metaclass_is_counted():
+    CISuit('CLUBS')
+    CIStr('A')
+    assert lookup_stats()[CISuit].hits == 1
+    assert lookup_stats()[CIStr].hits == 1
+
+
+def test_top_misses_keeps_frequent_values():
+    for value in ['x', 'x', 'x', 'y', 'y', 'y', 'z', 'a']:
+        Suit.get(value)
+    top = lookup_stats()[Suit].top_misses(3)
+    assert sorted(top[:2]) == [('x', 3), ('y', 3)]
+    # 'a' took over the counter of 'z'
+    assert top[2] == ('a', 2)
+    assert len(lookup_stats()[Suit]._missed) == 3
+
+
+def test_unhashable_misses_are_tracked_by_repr():
+    Suit.get(['x'])
+    assert lookup_stats()[Suit].top_misses() == [("['x']", 1)]
+
+
+def test_callback():
+    calls = []
+    enable_lookup_stats(callback=lambda *args: calls.append(args[:3]))
+    Suit('c')
+    Suit.get('x')
+    assert calls == [(Suit, 'c', Suit.CLUBS), (Suit, 'x', None)]
+
+
+def test_classes_made_while_enabled_are_counted():
+    class Late(MultiValueEnum):
+        A = 1, 2
+
+    Late(2)
+    assert lookup_stats()[Late].hits == 1
+
+
+def test_stats_do_not_keep_the_class():
+    class Temporary(MultiValueEnum):
+        A = 1, 2
+
+    Temporary(2)
+    stats = lookup_stats()[Temporary]
+    assert stats.enum_class is Temporary
+    temporary_ref = weakref.ref(Temporary)
+    del Temporary
+    gc.collect()
+    assert temporary_ref() is None
+    assert stats.enum_class is None
+    assert repr(stats) == '<LookupStats Temporary: 1 hits, 0 misses>'
+
+
+def test_disabled_lookups_are_not_wrapped():
+    disable_lookup_stats()
+    Suit('c')
+    assert Suit not in lookup_stats()
+    assert not hasattr(enum_custom._finder(Suit), '__wrapped__')
+
+
+def test_as_dict():
+    Suit.get('x')
+    assert lookup_stats()[Suit].as_dict() == {
+        'enum': 'test_lookup_stats.Suit',
+        'lookups': 1,
+        'hits': 0,
+        'misses': 1,
+        'hit_ratio': 0.0,
+        'seconds': lookup_stats()[Suit].seconds,
+        'top_misses': [('x', 1)],
+    }
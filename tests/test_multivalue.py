@@ -2,10 +2,15 @@
 from __future__ import unicode_literals
 
 import pickle
+import threading
 import six
+from enum import Enum
 from six.moves import range
 from pytest import raises, raises_regexp
-from enum_custom import MultiValueEnum, OrderableMixin, no_overlap
+import enum_custom
+from enum_custom import (MultiValueEnum, CaseInsensitiveMultiValueEnum,
+                         OrderableMixin, no_overlap, Interval,
+                         AmbiguousPrefixError, _int_table)
 
 
 class MyMultiValueEnum(MultiValueEnum):
@@ -22,6 +27,12 @@ class MyOrderableMultiValueEnum(OrderableMixin, MultiValueEnum):
     three = 3, 'three'
 
 
+class MyCompactMVE(MultiValueEnum):
+    __compact__ = True
+    one = 1, 'one'
+    two = 2, 'two'
+
+
 def test_equality():
     assert MyMultiValueEnum(2) == MyMultiValueEnum.two == MyMultiValueEnum('two')
     assert MyMultiValueEnum.one.value == (1, 'one', 'One')
@@ -118,6 +129,84 @@ def test_orderable_with_mixin():
     assert MyOrderableMultiValueEnum.three >= MyOrderableMultiValueEnum.one
 
 
+def test_ordinal_is_definition_order():
+    assert MyOrderableMultiValueEnum.one.ordinal == 0
+    assert MyOrderableMultiValueEnum('two').ordinal == 1
+    assert MyOrderableMultiValueEnum(3).ordinal == 2
+
+
+def test_sort_key():
+    members = [MyOrderableMultiValueEnum.three, MyOrderableMultiValueEnum.one,
+               MyOrderableMultiValueEnum.two]
+    assert sorted(members, key=MyOrderableMultiValueEnum.sort_key) == \
+        sorted(members) == list(MyOrderableMultiValueEnum)
+
+
+def test_orderable_with_plain_enum():
+    class MyOrderableEnum(OrderableMixin, Enum):
+        if six.PY2:
+            __order__ = 'b a'
+        b = 2
+        a = 1
+
+    assert MyOrderableEnum.b < MyOrderableEnum.a
+    assert MyOrderableEnum.a >= MyOrderableEnum.b
+    assert MyOrderableEnum.a.ordinal == 1
+
+
+class TestLookupMany:
+    def test_members_in_order(self):
+        results, misses = MyMultiValueEnum.lookup_many([2, 'one', 'three', 'One'])
+        assert results == [MyMultiValueEnum.two, MyMultiValueEnum.one,
+                           MyMultiValueEnum.three, MyMultiValueEnum.one]
+        assert misses == []
+
+    def test_misses_are_reported_as_positions(self):
+        results, misses = MyMultiValueEnum.lookup_many(['B', 1, [], 'ONE'],
+                                                       default='missing')
+        assert results == ['missing', MyMultiValueEnum.one, 'missing', 'missing']
+        assert misses == [0, 2, 3]
+
+    def test_ordinals(self):
+        results, misses = MyMultiValueEnum.lookup_many(
+            iter([3, 'two', 4]), default=-1, ordinals=True)
+        assert results == [2, 1, -1]
+        assert misses == [2]
+
+    def test_members_and_original_values(self):
+        results, misses = MyMultiValueEnum.lookup_many(
+            [MyMultiValueEnum.two, (3, 'three')])
+        assert results == [MyMultiValueEnum.two, MyMultiValueEnum.three]
+        assert misses == []
+
+
+class TestGet:
+    def test_get(self):
+        assert MyMultiValueEnum.get('One') is MyMultiValueEnum.one
+        assert MyMultiValueEnum.get(3) is MyMultiValueEnum.three
+        assert MyMultiValueEnum.get(MyMultiValueEnum.two) is MyMultiValueEnum.two
+        assert MyMultiValueEnum.get((2, 'two')) is MyMultiValueEnum.two
+
+    def test_get_missing_returns_default(self):
+        assert MyMultiValueEnum.get('B') is None
+        assert MyMultiValueEnum.get('B', 'missing') == 'missing'
+        assert MyMultiValueEnum.get([]) is None
+        assert MyMultiValueEnum.get(MyOrderableMultiValueEnum.one) is None
+
+    def test_get_unhashable_member_value(self):
+        class MySetMVE(MultiValueEnum):
+            A = {1, 2}
+
+        assert MySetMVE.get({1, 2}) is MySetMVE.A
+        assert MySetMVE.get([1]) is None
+
+    def test_contains(self):
+        assert 'one' in MyMultiValueEnum
+        assert MyMultiValueEnum.one in MyMultiValueEnum
+        assert 'ONE' not in MyMultiValueEnum
+        assert {} not in MyMultiValueEnum
+
+
 def test_lookup_like_a_dict_is_the_same_as_call():
     assert MyMultiValueEnum['one'] == MyMultiValueEnum.one == MyMultiValueEnum(1)
 
@@ -294,6 +383,662 @@ class TestNoOverapping:
                 B = range(10)
 
 
+    def test_reports_every_common_element(self):
+        # grouped by alias, 2 is in A, C and D
+        error_message = (r"C & A -> \{1\}, C & B -> \{5\}, "
+                         r"D & C & A -> \{2\}$")
+        with raises_regexp(ValueError, error_message):
+            @no_overlap
+            class MyManyOverlapsMVE(MultiValueEnum):
+                if six.PY2:
+                    __order__ = 'A B C D'
+                A = (1, 2, 3)
+                B = (4, 5)
+                C = (1, 5, 2)
+                D = (2, 6)
+
+    def test_alias_of_many_members_is_reported_once(self):
+        with raises(ValueError) as error:
+            @no_overlap
+            class MySharedAliasMVE(MultiValueEnum):
+                if six.PY2:
+                    __order__ = 'A B C D'
+                A = 'x', 1
+                B = 'x', 2
+                C = 'x', 3, 1
+                D = 'x', 4
+
+        message = str(error.value)
+        assert message.count('x') == 1
+        assert message.endswith("C & A -> {}, D & C & B & A -> {}".format(
+            {1}, {'x'}))
+
+    def test_case_sensitive_by_default(self):
+        @no_overlap
+        class MyCaseMVE(MultiValueEnum):
+            A = ('a', 'b')
+            B = ('A', 'B')
+
+        assert MyCaseMVE('A') is MyCaseMVE.B
+
+
+class TestIntervals:
+    class MyStatusMVE(MultiValueEnum):
+        if six.PY2:
+            __order__ = 'INFO OK REDIRECT CUSTOM ERROR'
+        INFO = range(100, 200)
+        OK = range(200, 300), 'ok'
+        REDIRECT = 304, range(300, 400)
+        CUSTOM = Interval(0.5, 1.5), 2
+        ERROR = Interval(400, 600), 399
+
+    def test_range_lookup(self):
+        assert self.MyStatusMVE(100) is self.MyStatusMVE.INFO
+        assert self.MyStatusMVE(199) is self.MyStatusMVE.INFO
+        assert self.MyStatusMVE(250) is self.MyStatusMVE.OK
+        assert self.MyStatusMVE('ok') is self.MyStatusMVE.OK
+        assert self.MyStatusMVE(301) is self.MyStatusMVE.REDIRECT
+
+    def test_range_values_are_not_expanded(self):
+        assert 150 not in self.MyStatusMVE._value2member_map_
+        assert self.MyStatusMVE.INFO.value == range(100, 200)
+
+    def test_range_only_contains_integers(self):
+        assert self.MyStatusMVE(150.0) is self.MyStatusMVE.INFO
+        with raises(ValueError):
+            self.MyStatusMVE(150.5)
+
+    def test_interval_contains_any_number(self):
+        assert self.MyStatusMVE(0.5) is self.MyStatusMVE.CUSTOM
+        assert self.MyStatusMVE(404.5) is self.MyStatusMVE.ERROR
+        with raises(ValueError):
+            self.MyStatusMVE(600)
+
+    def test_ranges_with_step_are_expanded(self):
+        class MyEvenMVE(MultiValueEnum):
+            EVEN = range(0, 10, 2)
+
+        assert MyEvenMVE(4) is MyEvenMVE.EVEN
+        assert 4 in MyEvenMVE._value2member_map_
+        with raises(ValueError):
+            MyEvenMVE(3)
+
+    def test_first_declared_wins(self):
+        # 304 is in REDIRECT, 399 in the range of REDIRECT
+        assert self.MyStatusMVE(304) is self.MyStatusMVE.REDIRECT
+        assert self.MyStatusMVE(399) is self.MyStatusMVE.REDIRECT
+
+        class MyOverlappingIntervalMVE(MultiValueEnum):
+            if six.PY2:
+                __order__ = 'A B'
+            A = Interval(0, 10), 20
+            B = Interval(5, 25)
+
+        assert MyOverlappingIntervalMVE(7) is MyOverlappingIntervalMVE.A
+        assert MyOverlappingIntervalMVE(20) is MyOverlappingIntervalMVE.A
+        assert MyOverlappingIntervalMVE(15) is MyOverlappingIntervalMVE.B
+        assert MyOverlappingIntervalMVE(21) is MyOverlappingIntervalMVE.B
+
+    def test_interval_under_range(self):
+        class MyRangeMVE(MultiValueEnum):
+            if six.PY2:
+                __order__ = 'A B C'
+            A = range(0, 10)
+            B = Interval(5.5, 20)
+            C = Interval(3, 7)
+
+        # the range only covers the integers
+        assert MyRangeMVE(5) is MyRangeMVE.A
+        assert MyRangeMVE(5.5) is MyRangeMVE.B
+        assert MyRangeMVE(9.5) is MyRangeMVE.B
+        assert MyRangeMVE(10) is MyRangeMVE.B
+        assert MyRangeMVE(6.5) is MyRangeMVE.B
+        assert MyRangeMVE(3.5) is MyRangeMVE.C
+        assert MyRangeMVE.get(2.5) is None
+        assert 5.5 in MyRangeMVE.B
+
+    def test_lookup_many(self):
+        results, misses = self.MyStatusMVE.lookup_many([101, 'ok', 1000],
+                                                       ordinals=True)
+        assert results == [0, 1, None]
+        assert misses == [2]
+
+    def test_no_overlap_between_intervals(self):
+        error_message = r"B & A -> \{Interval\(5, 10\)\}"
+        with raises_regexp(ValueError, error_message):
+            @no_overlap
+            class MyOverlappingIntervalMVE(MultiValueEnum):
+                if six.PY2:
+                    __order__ = 'A B'
+                A = Interval(0, 10),
+                B = Interval(5, 25),
+
+    def test_no_overlap_between_interval_and_alias(self):
+        error_message = r"B & A -> \{20\}"
+        with raises_regexp(ValueError, error_message):
+            @no_overlap
+            class MyOverlappingIntervalMVE(MultiValueEnum):
+                if six.PY2:
+                    __order__ = 'A B'
+                A = range(0, 10), 20
+                B = range(15, 30)
+
+    def test_no_overlap_with_intervals(self):
+        @no_overlap
+        class MyIntervalMVE(MultiValueEnum):
+            A = range(0, 10), 20
+            B = range(10, 20), Interval(20.5, 30)
+
+        assert MyIntervalMVE(20) is MyIntervalMVE.A
+
+
+class TestCompact:
+    class MyCompactMVE(MultiValueEnum):
+        __compact__ = True
+        if six.PY2:
+            __order__ = 'one two three'
+        one = 1, 'one', 'One'
+        two = [2, 'two']
+        three = (n for n in (3, 'three'))
+
+    def test_lookup(self):
+        assert self.MyCompactMVE('One') is self.MyCompactMVE.one
+        assert self.MyCompactMVE(2) is self.MyCompactMVE.two
+        assert self.MyCompactMVE('three') is self.MyCompactMVE.three
+        assert self.MyCompactMVE((1, 'one', 'One')) is self.MyCompactMVE.one
+
+    def test_values_are_made_from_the_lookup_table(self):
+        assert '_alias_table_' not in vars(self.MyCompactMVE)
+        assert self.MyCompactMVE.one.value == (1, 'one', 'One')
+        assert self.MyCompactMVE.two.value == (2, 'two')
+        # not exhausted, unlike generator values without compact
+        assert self.MyCompactMVE.three.value == (3, 'three')
+        assert self.MyCompactMVE.one.value + ('z',) == (1, 'one', 'One', 'z')
+        assert self.MyCompactMVE.three.canonical == 3
+
+    def test_whole_value(self):
+        class MyCompactCIMVE(CaseInsensitiveMultiValueEnum):
+            __compact__ = True
+            one = 1, 'one', 'One'
+            two = 2, 'two'
+
+        assert MyCompactCIMVE.one.value == (1, 'ONE')
+        assert MyCompactCIMVE((1, 'one', 'One')) is MyCompactCIMVE.one
+        assert MyCompactCIMVE.get((1, 'one', 'x')) is None
+        assert MyCompactCIMVE.get((1, 'two')) is None
+        assert MyCompactCIMVE.get((1,)) is None
+
+    def test_intern(self):
+        class MyInternedMVE(MultiValueEnum):
+            __compact__ = True
+            __intern__ = True
+            one = 1, str('').join([str('o'), str('ne')])
+
+        class MyOtherInternedMVE(MultiValueEnum):
+            __intern__ = True
+            uno = 1, str('').join([str('o'), str('ne')])
+
+        first, = [alias for alias in MyInternedMVE._value2member_map_
+                  if alias == 'one']
+        second, = [alias for alias in MyOtherInternedMVE._value2member_map_
+                   if alias == 'one']
+        assert first is second
+
+    def test_repr(self):
+        assert repr(self.MyCompactMVE.two) == "<MyCompactMVE.two: (2, {!r})>"\
+            .format('two')
+
+    def test_pickable(self):
+        dumped = pickle.dumps(MyCompactMVE.two)
+        assert pickle.loads(dumped) is MyCompactMVE.two
+
+
+class TestNormalizers:
+    class MyNormalizedMVE(MultiValueEnum):
+        __normalizers__ = (six.text_type.strip, six.text_type.lower,
+                           {'legacy': 'one'})
+        __normalize_cache_size__ = 2
+        one = 1, 'one'
+        two = 2, 'two'
+
+    def setup_method(self, method):
+        self.MyNormalizedMVE.normalize_cache_clear()
+
+    def test_lookup(self):
+        assert self.MyNormalizedMVE(' One ') is self.MyNormalizedMVE.one
+        assert self.MyNormalizedMVE('LEGACY') is self.MyNormalizedMVE.one
+        assert self.MyNormalizedMVE.get(' TWO') is self.MyNormalizedMVE.two
+
+    def test_not_applicable_normalizers_are_skipped(self):
+        assert self.MyNormalizedMVE(2) is self.MyNormalizedMVE.two
+        assert self.MyNormalizedMVE.get(3) is None
+        assert self.MyNormalizedMVE.get(['one']) is None
+
+    def test_miss(self):
+        with raises(ValueError):
+            self.MyNormalizedMVE(' three ')
+
+    def test_only_misses_are_normalized_and_cached(self):
+        self.MyNormalizedMVE('one')
+        assert self.MyNormalizedMVE.normalize_cache_info().currsize == 0
+        self.MyNormalizedMVE('One')
+        self.MyNormalizedMVE('One')
+        self.MyNormalizedMVE.get('x')
+        self.MyNormalizedMVE.get('x')
+        info = self.MyNormalizedMVE.normalize_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+    def test_least_recently_used_is_evicted(self):
+        for value in ['One', 'Two', 'One', 'TWO ']:
+            self.MyNormalizedMVE(value)
+        info = self.MyNormalizedMVE.normalize_cache_info()
+        assert (info.evictions, info.maxsize, info.currsize) == (1, 2, 2)
+        # 'Two' was evicted, 'One' is still cached
+        self.MyNormalizedMVE('One')
+        assert self.MyNormalizedMVE.normalize_cache_info().hits == info.hits + 1
+
+    def test_no_normalizers(self):
+        assert MyMultiValueEnum.normalize_cache_info() is None
+
+
+class TestLazy:
+    def test_indexed_at_first_lookup(self):
+        class MyLazyMVE(MultiValueEnum):
+            __lazy__ = True
+            one = 1, 'one'
+            two = 2, 'two'
+
+        assert MyLazyMVE.one.value == (1, 'one')
+        assert 'one' not in MyLazyMVE._value2member_map_
+        assert MyLazyMVE('one') is MyLazyMVE.one
+        assert 'one' in MyLazyMVE._value2member_map_
+        assert MyLazyMVE.get('x') is None
+
+    def test_errors_at_first_lookup(self):
+        class MyLazyMVE(MultiValueEnum):
+            __lazy__ = True
+            one = 'one'
+
+        for _ in range(2):
+            with raises(TypeError):
+                MyLazyMVE('one')
+
+    def test_indexed_once_from_threads(self):
+        import threading
+
+        class MyLazyMVE(MultiValueEnum):
+            __lazy__ = True
+            one = 1, 'one'
+
+        calls = []
+        index_aliases = type(MyLazyMVE)._index_aliases
+
+        def counting(cls):
+            calls.append(cls)
+            index_aliases(cls)
+
+        results = []
+        type(MyLazyMVE)._index_aliases = counting
+        try:
+            threads = [threading.Thread(target=lambda: results.append(MyLazyMVE(1)))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            type(MyLazyMVE)._index_aliases = index_aliases
+        assert calls == [MyLazyMVE]
+        assert results == [MyLazyMVE.one] * 8
+
+    def test_functional_api_is_indexed(self):
+        MyFunctionalMVE = MultiValueEnum('MyFunctionalMVE', [('one', (1, 'one')),
+                                                             ('two', (2, 'two'))])
+        assert MyFunctionalMVE('two') is MyFunctionalMVE.two
+        assert MyFunctionalMVE.lookup_many(['one'], ordinals=True) == ([0], [])
+
+
+class TestPrefix:
+    class MySuit(MultiValueEnum):
+        CLUBS = 'c', 'clubs'
+        DIAMONDS = 'd', 'diamonds', 'dia'
+        DIRT = 'dirt', 1
+        HEARTS = 'h', 'hearts'
+
+    def test_unique_prefix(self):
+        assert self.MySuit.from_prefix('cl') is self.MySuit.CLUBS
+        assert self.MySuit.from_prefix('diam') is self.MySuit.DIAMONDS
+        assert self.MySuit.from_prefix('HE') is self.MySuit.HEARTS
+
+    def test_whole_alias_wins(self):
+        assert self.MySuit.from_prefix('d') is self.MySuit.DIAMONDS
+        assert self.MySuit.from_prefix('dia') is self.MySuit.DIAMONDS
+
+    def test_ambiguous(self):
+        with raises(AmbiguousPrefixError) as excinfo:
+            self.MySuit.from_prefix('di')
+        assert excinfo.value.candidates == [self.MySuit.DIAMONDS, self.MySuit.DIRT]
+        assert 'DIAMONDS, DIRT' in str(excinfo.value)
+        with raises(ValueError):
+            self.MySuit.from_prefix('D')
+
+    def test_not_found(self):
+        with raises(ValueError):
+            self.MySuit.from_prefix('x')
+        with raises(TypeError):
+            self.MySuit.from_prefix(1)
+
+    def test_completions(self):
+        assert self.MySuit.completions('di') == ['dia', 'diamonds', 'dirt']
+        assert self.MySuit.completions('D') == ['DIAMONDS', 'DIRT']
+        assert self.MySuit.completions('x') == []
+
+
+class TestBytes:
+    class MyCodes(MultiValueEnum):
+        __encoding__ = 'latin-1'
+        OK = 'OK', b'\x00'
+        FAIL = 'FAIL', 'É'
+        RETRY = 'RETRY', 3
+
+    def test_get_bytes(self):
+        assert self.MyCodes.get_bytes(b'OK') is self.MyCodes.OK
+        assert self.MyCodes.get_bytes(b'\x00') is self.MyCodes.OK
+        assert self.MyCodes.get_bytes(b'\xc9') is self.MyCodes.FAIL
+        assert self.MyCodes.get_bytes(b'ok') is None
+        assert self.MyCodes.get_bytes(b'x', 'default') == 'default'
+
+    def test_any_buffer(self):
+        assert self.MyCodes.get_bytes(bytearray(b'FAIL')) is self.MyCodes.FAIL
+        assert self.MyCodes.get_bytes(memoryview(b'xxFAIL')[2:]) is self.MyCodes.FAIL
+
+    def test_utf8_by_default(self):
+        assert MyMultiValueEnum.get_bytes('One'.encode('utf-8')) is MyMultiValueEnum.one
+
+    def test_lookup_bytes_many(self):
+        buffer = b'OK,FAIL,NOPE,RETRY'
+        offsets = [(0, 2), (3, 7), (8, 12), (13, 18)]
+        for data in (buffer, bytearray(buffer), memoryview(buffer)):
+            assert self.MyCodes.lookup_bytes_many(data, offsets) == \
+                ([self.MyCodes.OK, self.MyCodes.FAIL, None, self.MyCodes.RETRY], [2])
+        assert self.MyCodes.lookup_bytes_many(buffer, offsets, -1, ordinals=True) \
+            == ([0, 1, -1, 2], [2])
+
+
+class TestMemberAliases:
+    class MyIntervalMVE(MultiValueEnum):
+        low = 'low', Interval(0, 10)
+        high = 'high', 5, Interval(10, 20)
+
+    def test_contains(self):
+        assert 'one' in MyMultiValueEnum.one
+        assert 1 in MyMultiValueEnum.one
+        assert 'two' not in MyMultiValueEnum.one
+        assert 'ONE' not in MyMultiValueEnum.one
+        assert ['one'] not in MyMultiValueEnum.one
+
+    def test_aliases_share_the_lookup_table_keys(self):
+        aliases = MyMultiValueEnum.three.aliases
+        assert aliases == frozenset([3, 'three'])
+        keys = dict((key, key) for key in MyMultiValueEnum._value2member_map_)
+        assert all(alias is keys[alias] for alias in aliases)
+
+    def test_canonical(self):
+        assert MyMultiValueEnum.one.canonical == 1
+        assert TestCompact.MyCompactMVE.three.canonical == 3
+
+    def test_intervals(self):
+        assert 3 in self.MyIntervalMVE.low
+        assert 15 in self.MyIntervalMVE.high
+        assert 20 not in self.MyIntervalMVE.high
+        # 5 belongs to the class lookup of low, but declared by high too
+        assert 5 in self.MyIntervalMVE.high
+        assert self.MyIntervalMVE(5) is self.MyIntervalMVE.low
+        assert self.MyIntervalMVE.high.aliases == frozenset(['high', 5])
+
+    def test_generator_values_are_kept(self):
+        class MyGeneratedMVE(MultiValueEnum):
+            one = (n for n in (1, 'one'))
+
+        assert MyGeneratedMVE.one.aliases == frozenset([1, 'one'])
+        assert 'one' in MyGeneratedMVE.one
+
+    def test_compact_and_lazy(self):
+        assert 'three' in TestCompact.MyCompactMVE.three
+
+        class MyLazyMVE(MultiValueEnum):
+            __lazy__ = True
+            one = 1, 'one'
+
+        assert 'one' in MyLazyMVE.one
+        assert '_interval_table_' in MyLazyMVE.__dict__
+
+    def test_alias_index(self):
+        index = MyMultiValueEnum.alias_index()
+        assert index[MyMultiValueEnum.two] == frozenset([2, 'two'])
+        assert list(index) == list(MyMultiValueEnum)
+        assert MyMultiValueEnum.alias_index() is index
+
+
+class TestFreeze:
+    class MyFrozenMVE(MultiValueEnum):
+        __freeze__ = True
+        if six.PY2:
+            __order__ = 'one two three'
+        one = [1, 2], 'one', {'key': [1]}
+        two = (1, 2), bytearray(b'two')
+        three = [[3], {3, 4}]
+
+    def test_unhashable_aliases(self):
+        assert self.MyFrozenMVE([1, 2]) is self.MyFrozenMVE.one
+        assert self.MyFrozenMVE({'key': [1]}) is self.MyFrozenMVE.one
+        assert self.MyFrozenMVE(bytearray(b'two')) is self.MyFrozenMVE.two
+        assert self.MyFrozenMVE(b'two') is self.MyFrozenMVE.two
+        assert self.MyFrozenMVE([3]) is self.MyFrozenMVE.three
+        assert self.MyFrozenMVE({3, 4}) is self.MyFrozenMVE.three
+        assert self.MyFrozenMVE.get([4]) is None
+
+    def test_lists_are_not_tuples(self):
+        assert self.MyFrozenMVE((1, 2)) is self.MyFrozenMVE.two
+        assert [1, 2] in self.MyFrozenMVE.one
+        assert (1, 2) not in self.MyFrozenMVE.one
+
+    def test_whole_value_without_scan(self, monkeypatch):
+        monkeypatch.setattr(type(self.MyFrozenMVE), '_scan_values', None)
+        assert self.MyFrozenMVE([[3], {3, 4}]) is self.MyFrozenMVE.three
+
+    def test_compact_and_lazy(self):
+        class MyCompactFrozenMVE(MultiValueEnum):
+            __freeze__ = True
+            __compact__ = True
+            one = [1], 'one'
+
+        class MyLazyFrozenMVE(MultiValueEnum):
+            __freeze__ = True
+            __lazy__ = True
+            one = [1], 'one'
+
+        for enum_class in (MyCompactFrozenMVE, MyLazyFrozenMVE):
+            assert enum_class([1]) is enum_class.one
+            assert enum_class(([1], 'one')) is enum_class.one
+            assert [1] in enum_class.one
+
+    def test_unhashable_aliases_need_freeze(self):
+        with raises(TypeError):
+            class MyUnhashableMVE(MultiValueEnum):
+                one = [1], 'one'
+
+
+class TestIntTable:
+    class MyStatusMVE(MultiValueEnum):
+        __alias_type__ = int
+        ok = 0, 1
+        warning = 2, 4
+        error = 5, 6
+
+    def test_dense_ints(self):
+        first, members = _int_table(self.MyStatusMVE)
+        assert first == 0
+        assert members == (self.MyStatusMVE.ok, self.MyStatusMVE.ok,
+                           self.MyStatusMVE.warning, None,
+                           self.MyStatusMVE.warning, self.MyStatusMVE.error,
+                           self.MyStatusMVE.error)
+
+    def test_sparse_or_mixed_use_the_dict(self):
+        class MySparseMVE(MultiValueEnum):
+            one = 1, 1000
+
+        class MyMixedMVE(MultiValueEnum):
+            one = 1, 'one'
+
+        assert _int_table(MySparseMVE) is None
+        assert _int_table(MyMixedMVE) is None
+        assert MySparseMVE(1000) is MySparseMVE.one
+
+    def test_lookup_many(self):
+        values = [4, 3, -1, 7, 'x', 6, True, [1], 5.0]
+        assert self.MyStatusMVE.lookup_many(values, ordinals=True) == \
+            ([1, None, None, None, None, 2, 0, None, 2], [1, 2, 3, 4, 7])
+
+    def test_declared_alias_type(self):
+        with raises(TypeError):
+            class MyStatusMVE(MultiValueEnum):
+                __alias_type__ = int
+                ok = 0, '0'
+
+        class MyMixedMVE(MultiValueEnum):
+            __alias_type__ = (int, six.text_type)
+            one = 1, 'one', Interval(10, 20)
+
+        assert MyMixedMVE(15) is MyMixedMVE.one
+
+
+class MyReloadableMVE(MultiValueEnum):
+    if six.PY2:
+        __order__ = 'one two three'
+    one = 1, 'one'
+    two = 2, 'two'
+    three = Interval(3, 10), 'three'
+
+
+class TestLoadAliases:
+    def teardown_method(self, method):
+        MyReloadableMVE.load_aliases({})
+
+    def test_extra_aliases(self):
+        MyReloadableMVE.load_aliases({MyReloadableMVE.one: ['uno', 11],
+                                      'two': ('dos',)})
+        assert MyReloadableMVE('uno') is MyReloadableMVE.one
+        assert MyReloadableMVE(11) is MyReloadableMVE.one
+        assert MyReloadableMVE('dos') is MyReloadableMVE.two
+        assert MyReloadableMVE('one') is MyReloadableMVE.one
+        assert MyReloadableMVE(5) is MyReloadableMVE.three
+        assert MyReloadableMVE.lookup_many(['uno', 'x']) == \
+            ([MyReloadableMVE.one, None], [1])
+
+    def test_replaces_previous_layer(self):
+        MyReloadableMVE.load_aliases({'one': ['uno']})
+        MyReloadableMVE.load_aliases({'one': ['eins']})
+        assert MyReloadableMVE.get('uno') is None
+        assert MyReloadableMVE('eins') is MyReloadableMVE.one
+        MyReloadableMVE.load_aliases({})
+        assert MyReloadableMVE.get('eins') is None
+
+    def test_overlaps_are_rejected(self):
+        MyReloadableMVE.load_aliases({'one': ['uno']})
+        for aliases in ({'one': ['two']}, {'one': [5]},
+                        {'one': ['x'], 'two': ['x']}):
+            with raises_regexp(ValueError, 'common element found'):
+                MyReloadableMVE.load_aliases(aliases)
+        # the previous layer is kept
+        assert MyReloadableMVE('uno') is MyReloadableMVE.one
+        # own aliases can be repeated
+        MyReloadableMVE.load_aliases({'one': ['one', 1, 'uno']})
+        with raises(KeyError):
+            MyReloadableMVE.load_aliases({'four': ['x']})
+
+    def test_tables_made_from_aliases_are_updated(self):
+        assert MyReloadableMVE.completions('u') == []
+        assert MyReloadableMVE.get_bytes(b'uno') is None
+        MyReloadableMVE.load_aliases({'one': ['uno']})
+        assert MyReloadableMVE.completions('u') == ['uno']
+        assert MyReloadableMVE.get_bytes(b'uno') is MyReloadableMVE.one
+
+    def test_tables_made_during_a_swap_are_not_kept(self, monkeypatch):
+        trie_class = enum_custom._PrefixTrie
+
+        def make_trie(items):
+            # aliases loaded while the trie of the old ones is made
+            monkeypatch.setattr(enum_custom, '_PrefixTrie', trie_class)
+            MyReloadableMVE.load_aliases({'one': ['uno']})
+            return trie_class(items)
+
+        monkeypatch.setattr(enum_custom, '_PrefixTrie', make_trie)
+        assert MyReloadableMVE.completions('u') == []
+        assert MyReloadableMVE.completions('u') == ['uno']
+        assert MyReloadableMVE.from_prefix('un') is MyReloadableMVE.one
+
+    def test_members_and_pickle_are_unaffected(self):
+        one = MyReloadableMVE.one
+        MyReloadableMVE.load_aliases({'one': ['uno']})
+        assert MyReloadableMVE('uno') is one
+        assert list(MyReloadableMVE) == [one, MyReloadableMVE.two,
+                                         MyReloadableMVE.three]
+        assert pickle.loads(pickle.dumps(one)) is one
+
+    def test_member_aliases_are_updated(self):
+        one = MyReloadableMVE.one
+        assert one.aliases == frozenset([1, 'one'])
+        assert MyReloadableMVE.alias_index()[one] == frozenset([1, 'one'])
+        MyReloadableMVE.load_aliases({'one': ['uno']})
+        assert 'uno' in one
+        assert 'uno' not in MyReloadableMVE.two
+        assert one.aliases == frozenset([1, 'one', 'uno'])
+        assert MyReloadableMVE.alias_index()[one] == frozenset([1, 'one', 'uno'])
+        MyReloadableMVE.load_aliases({})
+        assert 'uno' not in one
+        assert one.aliases == frozenset([1, 'one'])
+
+    def test_int_table_is_swapped_with_the_lookup_function(self):
+        class MyCodesMVE(MultiValueEnum):
+            ok = 0, 1
+            error = 2, 3
+
+        assert _int_table(MyCodesMVE) == (0, (MyCodesMVE.ok, MyCodesMVE.ok,
+                                              MyCodesMVE.error, MyCodesMVE.error))
+        MyCodesMVE.load_aliases({'error': [4]})
+        assert MyCodesMVE.lookup_many([4, 0, 5]) == \
+            ([MyCodesMVE.error, MyCodesMVE.ok, None], [2])
+        assert _int_table(MyCodesMVE)[1][4] is MyCodesMVE.error
+        MyCodesMVE.load_aliases({'error': ['x']})
+        assert _int_table(MyCodesMVE) is None
+        assert MyCodesMVE.lookup_many([4, 'x']) == ([None, MyCodesMVE.error], [0])
+
+    def test_concurrent_lookups_see_whole_tables(self):
+        layers = [{'one': ['a{}'.format(n) for n in range(50)],
+                   'two': ['b{}'.format(n) for n in range(50)]},
+                  {'one': ['b{}'.format(n) for n in range(50)],
+                   'two': ['a{}'.format(n) for n in range(50)]}]
+        errors = []
+        done = []
+
+        def look_up():
+            while not done:
+                first, last = MyReloadableMVE.lookup_many(['a0', 'a49'])[0]
+                if first is not last:
+                    errors.append((first, last))
+
+        thread = threading.Thread(target=look_up)
+        thread.start()
+        try:
+            for n in range(200):
+                MyReloadableMVE.load_aliases(layers[n % 2])
+        finally:
+            done.append(True)
+            thread.join()
+        assert not errors
+
+
 class TestAliases:
     def test_alias_should_pick_first_value(self):
         class MyAliasedMVE(MultiValueEnum):
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+import six
+from pytest import raises
+from enum_custom import (MultiValueEnum, CaseInsensitiveMultiValueEnum,
+                         encode_array, decode_array, Interval, _int_table)
+
+numpy = pytest.importorskip('numpy')
+
+
+class MyMultiValueEnum(MultiValueEnum):
+    one = 1, 'one', 'One'
+    two = 2, 'two'
+    three = 3, 'three', 30
+
+
+class MyInsensitiveMVE(CaseInsensitiveMultiValueEnum):
+    one = 1, 'onE'
+    two = 2, 'tWo'
+
+
+def test_encode_int_array():
+    codes = encode_array(MyMultiValueEnum, numpy.array([3, 1, 5, 30, 2]))
+    assert codes.tolist() == [2, 0, -1, 2, 1]
+
+
+def test_encode_dense_int_array():
+    class MyCodesMVE(MultiValueEnum):
+        ok = 200, 201, 204
+        moved = 301, 302
+        missing = 404, 410
+
+    assert _int_table(MyCodesMVE) is None
+    MyDenseMVE = MultiValueEnum('MyDenseMVE', [
+        ('code{}'.format(code), (code, code + 100)) for code in range(100)])
+    # classes made with the functional API are indexed at the first lookup
+    values = numpy.array([[0, 199], [200, -1]], dtype=numpy.int16)
+    assert encode_array(MyDenseMVE, values).tolist() == [[0, 99], [-1, -1]]
+    assert _int_table(MyDenseMVE) is not None
+    assert encode_array(MyDenseMVE, [150, 5, 300], missing=-9).tolist() == \
+        [50, 5, -9]
+
+
+def test_encode_float_aliases():
+    class MyFloatMVE(MultiValueEnum):
+        a = 1, 2.5
+        b = 3.0, 'b'
+
+    assert MyFloatMVE(2.5) is MyFloatMVE.a
+    values = numpy.array([2.5, 1.0, 3.0, 1.5])
+    assert encode_array(MyFloatMVE, values).tolist() == [0, 0, 1, -1]
+    assert encode_array(MyFloatMVE, numpy.array([3, 1, 2])).tolist() == \
+        [1, 0, -1]
+
+
+def test_encode_str_array():
+    codes = encode_array(MyMultiValueEnum, ['two', 'One', 'ONE', 'three'])
+    assert codes.tolist() == [1, 0, -1, 2]
+
+
+def test_encode_keeps_shape():
+    codes = encode_array(MyMultiValueEnum, numpy.array([[1, 2], [3, 4]]))
+    assert codes.tolist() == [[0, 1], [2, -1]]
+
+
+def test_encode_object_array():
+    values = numpy.array([1, 'two', None, 3.0], dtype=object)
+    codes = encode_array(MyMultiValueEnum, values, missing=-2)
+    assert codes.tolist() == [0, 1, -2, 2]
+
+
+def test_encode_case_insensitive():
+    codes = encode_array(MyInsensitiveMVE, ['ONE', 'two', 'three'])
+    assert codes.tolist() == [0, 1, -1]
+
+
+def test_encode_no_aliases_of_that_type():
+    class MyIntMVE(MultiValueEnum):
+        a = 1, 2
+
+    assert encode_array(MyIntMVE, ['a', 'b']).tolist() == [-1, -1]
+
+
+def test_encode_intervals():
+    class MyIntervalMVE(MultiValueEnum):
+        a = range(0, 10), 15
+        b = Interval(12.5, 20), 5
+
+    values = numpy.array([3, 5, 15, 10, 12, 19])
+    assert encode_array(MyIntervalMVE, values).tolist() == [0, 0, 0, -1, -1, 1]
+    values = numpy.array([3.0, 3.5, 12.5, 20.0])
+    assert encode_array(MyIntervalMVE, values).tolist() == [0, -1, 1, -1]
+
+
+def test_encode_interval_under_range():
+    class MyRangeMVE(MultiValueEnum):
+        if six.PY2:
+            __order__ = 'a b'
+        a = range(0, 10)
+        b = Interval(5.5, 20)
+
+    values = numpy.array([5.0, 5.5, 9.5, 10.0, 2.5])
+    assert encode_array(MyRangeMVE, values).tolist() == [0, 1, 1, 1, -1]
+
+
+def test_encode_normalized():
+    class MyNormalizedMVE(CaseInsensitiveMultiValueEnum):
+        __normalizers__ = (six.text_type.strip, {'legacy': 'one'})
+        one = 1, 'one'
+        two = 2, 'two'
+
+    values = numpy.array([' One', 'TWO', 'legacy', 'x'])
+    assert encode_array(MyNormalizedMVE, values).tolist() == [0, 1, 0, -1]
+
+
+def test_decode():
+    codes = numpy.array([2, -1, 0])
+    assert decode_array(MyMultiValueEnum, codes).tolist() == \
+        [MyMultiValueEnum.three, None, MyMultiValueEnum.one]
+    assert decode_array(MyMultiValueEnum, codes, to='name').tolist() == \
+        ['three', None, 'one']
+    assert decode_array(MyInsensitiveMVE, [1, 0], to='value').tolist() == \
+        [2, 1]
+
+
+def test_decode_invalid_codes():
+    for codes in ([-2], [3], [0, 5]):
+        with raises(ValueError):
+            decode_array(MyMultiValueEnum, codes)
+
+
+def test_decode_missing_code():
+    codes = encode_array(MyMultiValueEnum, ['two', 'x'], missing=99)
+    assert decode_array(MyMultiValueEnum, codes, missing='?',
+                        missing_code=99).tolist() == [MyMultiValueEnum.two, '?']
+    with raises(ValueError):
+        decode_array(MyMultiValueEnum, codes)
+
+
+def test_roundtrip():
+    values = numpy.array(['two', 'three', 'one'])
+    codes = encode_array(MyMultiValueEnum, values)
+    assert decode_array(MyMultiValueEnum, codes, to='name').tolist() == \
+        ['two', 'three', 'one']
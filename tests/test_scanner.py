@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+from pytest import raises
+from enum_custom import (MultiValueEnum, CaseInsensitiveMultiValueEnum,
+                         AliasScanner)
+
+
+class Level(MultiValueEnum):
+    ERROR = 'error', 'err', b'ERR'
+    WARNING = 'warning', 'warn', 1
+    INFO = 'info', 'he'
+
+
+class CILevel(CaseInsensitiveMultiValueEnum):
+    ERROR = 'error', 'err'
+    INFO = 'info',
+
+
+def matches(scanner, text):
+    return [(start, end, member.name) for start, end, member in scanner.scan(text)]
+
+
+def test_every_occurrence():
+    scanner = AliasScanner(Level)
+    assert matches(scanner, 'warn: error, info') == [
+        (0, 4, 'WARNING'), (6, 9, 'ERROR'), (6, 11, 'ERROR'), (13, 17, 'INFO')]
+
+
+def test_overlapping_aliases():
+    scanner = AliasScanner(Level)
+    assert matches(scanner, 'warning') == [(0, 4, 'WARNING'), (0, 7, 'WARNING')]
+    assert matches(scanner, 'there') == [(1, 3, 'INFO')]
+
+
+def test_case_sensitive():
+    assert matches(AliasScanner(Level), 'ERROR Info') == []
+
+
+def test_case_insensitive():
+    scanner = AliasScanner(CILevel)
+    assert matches(scanner, 'ERROR Info') == [
+        (0, 3, 'ERROR'), (0, 5, 'ERROR'), (6, 10, 'INFO')]
+
+
+def test_case_insensitive_keeps_offsets():
+    # 'ß'.upper() is 'SS', longer than the original
+    scanner = AliasScanner(CILevel)
+    assert matches(scanner, 'ßerr') == [(1, 4, 'ERROR')]
+
+
+def test_whole_words():
+    scanner = AliasScanner(Level, whole_words=True)
+    assert matches(scanner, 'warning: errors, err_x, err') == [
+        (0, 7, 'WARNING'), (24, 27, 'ERROR')]
+
+
+def test_bytes():
+    scanner = AliasScanner(Level)
+    assert [(start, end, member) for start, end, member
+            in scanner.scan(b'an ERR and err')] == [(3, 6, Level.ERROR),
+                                                   (11, 14, Level.ERROR)]
+
+
+def test_bytes_match_encoded_str_aliases():
+    class Suit(MultiValueEnum):
+        __encoding__ = 'latin-1'
+        CLUBS = 'clubs', '\xe9p'
+
+    scanner = AliasScanner(Suit)
+    assert list(scanner.scan(b'i like clubs')) == [(7, 12, Suit.CLUBS)]
+    assert list(scanner.scan('\xe9p'.encode('latin-1'))) == [(0, 2, Suit.CLUBS)]
+    assert list(scanner.scan(b'CLUBS')) == []
+
+
+def test_bytes_case_insensitive():
+    scanner = AliasScanner(CILevel, whole_words=True)
+    assert list(scanner.scan(b'Info: an Error')) == [
+        (0, 4, CILevel.INFO), (9, 14, CILevel.ERROR)]
+    assert list(AliasScanner(CILevel).scan_file(io.BytesIO(b'eRr'),
+                                                chunk_size=2)) == \
+        [(0, 3, CILevel.ERROR)]
+
+
+def test_bytes_whole_words():
+    scanner = AliasScanner(Level, whole_words=True)
+    assert list(scanner.scan(b'ERRx ERR')) == [(5, 8, Level.ERROR)]
+
+
+def test_chunks():
+    scanner = AliasScanner(Level, whole_words=True)
+    chunks = ['war', 'ning er', 'r', ' in', 'fo', 'x info']
+    assert [(start, end, member.name) for start, end, member
+            in scanner.scan_chunks(chunks)] == [
+        (0, 7, 'WARNING'), (8, 11, 'ERROR'), (18, 22, 'INFO')]
+
+
+def test_chunks_can_not_mix_types():
+    with raises(TypeError):
+        list(AliasScanner(Level).scan_chunks(['err', b'err']))
+
+
+def test_file():
+    scanner = AliasScanner(Level)
+    text = 'info ' * 10
+    result = list(scanner.scan_file(io.StringIO(text), chunk_size=3))
+    assert result == list(scanner.scan(text))
+    assert len(result) == 10
+
+
+def test_no_aliases_of_that_type():
+    class Numbers(MultiValueEnum):
+        one = 1, 2
+
+    assert list(AliasScanner(Numbers).scan('1 2')) == []
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+from pytest import raises
+from enum_custom import (MultiValueEnum, CaseInsensitiveMultiValueEnum,
+                         SharedAliasTable, Interval)
+
+
+class Suit(MultiValueEnum):
+    CLUBS = '♣', 'c', 1
+    DIAMONDS = '♦', 'd', b'd', 2.5
+    HEARTS = '♥', 'h', 3
+
+
+class CISuit(CaseInsensitiveMultiValueEnum):
+    CLUBS = 'c', 'Clubs'
+    SPADES = 's', 'Spades'
+
+
+def test_lookup():
+    table = SharedAliasTable(Suit, SharedAliasTable.dump(Suit))
+    assert len(table) == 10
+    assert table('♣') is Suit.CLUBS
+    assert table(b'd') is Suit.DIAMONDS
+    assert table(2.5) is Suit.DIAMONDS
+    assert table.get('x') is None
+    assert table.get(Suit.CLUBS, 0) is Suit.CLUBS
+    assert table(Suit.HEARTS) is Suit.HEARTS
+    assert 'h' in table
+    assert 'H' not in table
+    with raises(ValueError):
+        table('x')
+
+
+def test_equal_numbers():
+    table = SharedAliasTable(Suit, SharedAliasTable.dump(Suit))
+    assert table(1.0) is Suit.CLUBS
+    assert table(True) is Suit.CLUBS
+    assert table.get(1.5) is None
+
+
+def test_case_insensitive():
+    table = SharedAliasTable(CISuit, SharedAliasTable.dump(CISuit))
+    assert table('SPADES') is CISuit.SPADES
+    assert table('clubs') is CISuit.CLUBS
+
+
+def test_lookup_many():
+    table = SharedAliasTable(Suit, memoryview(SharedAliasTable.dump(Suit)))
+    assert table.lookup_many(['c', 'x', 3], default=-1, ordinals=True) == \
+        ([0, -1, 2], [1])
+
+
+def test_file(tmpdir):
+    path = str(tmpdir.join('suit.table'))
+    with SharedAliasTable.create(Suit, path) as table:
+        assert table('h') is Suit.HEARTS
+    with SharedAliasTable.open(Suit, path) as table:
+        assert table.lookup_many(['c', 'd']) == ([Suit.CLUBS, Suit.DIAMONDS], [])
+
+
+def test_shared_memory():
+    shared_memory = pytest.importorskip('multiprocessing.shared_memory')
+    data = SharedAliasTable.dump(Suit)
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        block.buf[:len(data)] = data
+        table = SharedAliasTable(Suit, block.buf)
+        assert table('d') is Suit.DIAMONDS
+        table.close()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_different_definition():
+    data = SharedAliasTable.dump(Suit)
+    with raises(ValueError):
+        SharedAliasTable(CISuit, data)
+    with raises(ValueError):
+        SharedAliasTable(Suit, data[:10])
+    with raises(ValueError):
+        SharedAliasTable(Suit, b'x' * len(data))
+
+
+def test_different_aliases():
+    data = SharedAliasTable.dump(Suit)
+
+    class OtherSuit(MultiValueEnum):
+        CLUBS = '♥', 'h', 3
+        DIAMONDS = '♦', 'd', b'd', 2.5
+        HEARTS = '♣', 'c', 1
+
+    OtherSuit.__name__ = 'Suit'
+    with raises(ValueError):
+        SharedAliasTable(OtherSuit, data)
+
+
+def test_lazy_enum_is_not_indexed():
+    class LazySuit(MultiValueEnum):
+        __lazy__ = True
+        CLUBS = '♣', 'c', 1
+        DIAMONDS = '♦', 'd', b'd', 2.5
+        HEARTS = '♥', 'h', 3
+
+    LazySuit.__name__ = 'Suit'
+    table = SharedAliasTable(LazySuit, SharedAliasTable.dump(Suit))
+    assert table('c') is LazySuit.CLUBS
+    assert '_interval_table_' not in vars(LazySuit)
+
+
+def test_values_iterated_once():
+    class GenSuit(MultiValueEnum):
+        CLUBS = (alias for alias in ('c', 'C'))
+        SPADES = 's', 'c'
+
+    class LazyGenSuit(MultiValueEnum):
+        __lazy__ = True
+        CLUBS = (alias for alias in ('c', 'C'))
+        SPADES = 's', 'c'
+
+    class CompactSuit(MultiValueEnum):
+        __compact__ = True
+        CLUBS = 'c', 'C'
+        SPADES = 's', 'c'
+
+    class OtherSuit(MultiValueEnum):
+        CLUBS = 'c', 'C'
+        SPADES = 's',
+
+    data = SharedAliasTable.dump(GenSuit)
+    for enum_class in (LazyGenSuit, CompactSuit):
+        enum_class.__name__ = 'GenSuit'
+        assert SharedAliasTable(enum_class, data)('c') is enum_class.CLUBS
+    OtherSuit.__name__ = 'GenSuit'
+    with raises(ValueError):
+        SharedAliasTable(OtherSuit, data)
+
+
+def test_unsupported_aliases():
+    class MyTupleMVE(MultiValueEnum):
+        one = (1, 2), 'one'
+
+    class MyIntervalMVE(MultiValueEnum):
+        one = Interval(0, 1), 'one'
+
+    with raises(TypeError):
+        SharedAliasTable.dump(MyTupleMVE)
+    with raises(TypeError):
+        SharedAliasTable.dump(MyIntervalMVE)
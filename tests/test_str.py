@@ -57,3 +57,28 @@ def test_comparison_will_happen_based_on_str_value():
 def test_members_are_comparable_to_simple_str_instances():
     assert MyReverseOrderedStrEnum.one < 'A'
     assert MyReverseOrderedStrEnum.one <= 'A'
+
+
+def test_get():
+    assert MyStrEnum.get('1') is MyStrEnum.one
+    assert MyStrEnum.get('3') is None
+    assert MyStrEnum.get(1, 'missing') == 'missing'
+
+
+def test_contains():
+    assert '2' in MyStrEnum
+    assert MyStrEnum.two in MyStrEnum
+    assert '3' not in MyStrEnum
+    assert 2 not in MyStrEnum
+
+
+def test_from_prefix():
+    assert MyOtherStrEnum.from_prefix('f') is MyOtherStrEnum.four
+    assert MyOtherStrEnum.from_prefix('4') is MyOtherStrEnum.four
+    assert MyOtherStrEnum.completions('') == ['1', '3', '4', 'four', 'one', 'three']
+
+
+def test_get_bytes():
+    assert MyStrEnum.get_bytes(b'1') is MyStrEnum.one
+    assert MyStrEnum.get_bytes(memoryview(b'2')) is MyStrEnum.two
+    assert MyStrEnum.get_bytes(b'3') is None